@@ -1,14 +1,58 @@
 import json
-from math import ceil
-from typing import List
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, NamedTuple
 import networkx as nx
-from latency_jitter_model.path_helpers import get_ancestor_tx_port_node_name, is_rx_port, is_tx_port
+import numpy as np
+from latency_jitter_model.path_helpers import build_path_index, build_port_masks, parse_path, get_ancestor_tx_port_node_name
 from latency_jitter_model.path_helpers import get_ancestor_forwarding_node_name
-from latency_jitter_model.helpers import ExpressPriorities, PortStatistics, StreamStatistics, debug, get_transmission_duration
+from latency_jitter_model.helpers import PortStatistics, StreamStatistics, debug, get_transmission_duration, get_transmission_durations
 from latency_jitter_model.stream import Stream
 from latency_jitter_model.topology import NodeAttrs, Topology
 
+class PortParams(NamedTuple):
+    """Static TAS and preemption attributes of one tx port node.
+    Collected once per path so the delay equations read plain attributes instead of hashing dict keys.
+    """
+    gcl: bool
+    gcl_cycle: int
+    gcl_open: int
+    gcl_offset: int
+    gcl_mask: int
+    """Priorities of gcl_priorities encoded as an 8-bit mask (bit n = priority n)"""
+    frame_preemption: bool
+    express_mask: int
+    """Priorities of express_priorities encoded as an 8-bit mask (bit n = priority n)"""
+    sync_jitter: int
+    """Sync jitter of the forwarding node the port belongs to"""
+
+class PathNodeMeta(NamedTuple):
+    """Static data of one node on a stream path (independent of the calculated delays).
+    The forwarding node, edge and port fields are only filled for tx port nodes.
+    """
+    node_data: dict
+    is_talker: bool = False
+    is_listener: bool = False
+    is_rx_port: bool = False
+    forwarding_node_name: str = None
+    forwarding_node_data: dict = None
+    ancestor_forwarding_node_name: str = None
+    is_synchronized: bool = True
+    edge_data: dict = None
+    port_params: PortParams = None
+
 class Calculator:
+    __slots__ = (
+        'topology', 'streams', 'stream_paths', 'bandwidth_per_stream_and_node',
+        'stream_statistics', '_path_cache', '_sync_cache', '_bandwidth_target_cache',
+        '_delays_calculated', '_interference_candidates', '_interference_cache',
+        '_node_data', 'streams_by_port', 'port_priority_index',
+        '_express_priorities_by_port', 'path_meta', 'tx_port_indices',
+        '_bandwidth_stable'
+    )
+    """Fixed attribute set: attribute access resolves via slot offset instead of
+    a per-instance dict lookup, which the delay loops hit constantly."""
+
     def __init__(self, topology: Topology, streams: List[Stream]) -> None:
         """
         @param streams All streams on the topology
@@ -29,16 +73,169 @@ class Calculator:
         """Statistics (delays, resource utilization) per stream with the stream name as key
         """
 
+        self._path_cache: dict[tuple, List[str]] = {}
+        """Already calculated shortest paths with the (sender, receiver) tuple as key.
+        Streams with identical endpoints share the same path list (paths are read-only in this module).
+        """
+
+        self._sync_cache: dict[tuple, bool] = {}
+        """Already answered `Topology.are_synchronized` queries with the node pair as key"""
+
+        self._bandwidth_target_cache: dict[tuple, List[tuple]] = {}
+        """Tx port nodes whose bandwidth has to be recalculated per path with the (sender, receiver) tuple as key"""
+
+        self._delays_calculated: set = set()
+        """Names of the streams whose delays have been calculated at least once"""
+
+        self._bandwidth_stable: bool = False
+        """Whether the last full recalculate_bandwidth pass left every bandwidth
+        unchanged and no delays have been recalculated since.
+        A repeated full pass can then be skipped entirely.
+        """
+
+        self._interference_candidates: dict[tuple, List[Stream]] = {}
+        """Streams with an interfering priority with the (port node name, observed priority) tuple as key.
+        The lists still contain the observed stream itself, which is filtered out per observed stream.
+        """
+
+        self._interference_cache: dict[tuple, List[Stream]] = {}
+        """Fully filtered get_interfering_streams results with the (stream name, port node name) tuple as key.
+        The topology and the streams do not change after construction, so the entries never get stale.
+        Callers must not modify the returned lists.
+        """
+
+        self._node_data: dict = dict(self.topology.G.nodes(data=True))
+        """Snapshot of the node attribute dicts, indexed by node name.
+        Every NodeDataView access goes through networkx call machinery; a plain dict does not.
+        The attribute dicts themselves are shared with the graph, so in-place changes stay visible.
+        """
+
+        for stream in streams:
+            self.stream_paths[stream.name] = self._get_path(stream.sender, stream.receiver)
+            self.stream_statistics[stream.name] = StreamStatistics(stream.name, self.stream_paths[stream.name], self._node_data)
+
+        self.streams_by_port: dict[str, List[Stream]] = defaultdict(list)
+        """Streams whose path crosses the given port node with the port node name as key.
+        The topology (and therefore the paths) does not change during the calculation,
+        so the index never has to be rebuilt.
+        """
+
+        for stream in streams:
+            for node_name in self.stream_paths[stream.name]:
+                self.streams_by_port[node_name].append(stream)
+
+        self.port_priority_index: dict[str, dict[int, List[Stream]]] = {}
+        """Streams crossing a port grouped by their priority.
+
+        - outer key = port node name
+        - inner key = stream priority
+        """
+
+        for port_node_name, port_streams in self.streams_by_port.items():
+            by_priority: dict[int, List[Stream]] = defaultdict(list)
+            for stream in port_streams:
+                by_priority[stream.priority].append(stream)
+            self.port_priority_index[port_node_name] = by_priority
+
+        all_nodes = self._node_data
+        self._express_priorities_by_port: dict[str, int] = {
+            node_name: all_nodes[node_name].get("express_priorities_mask", 0)
+            for node_name in self.streams_by_port
+        }
+        """Express priorities of each crossed port node as an 8-bit mask (0 for forwarding nodes)"""
+
+        self.path_meta: dict[tuple, List[PathNodeMeta]] = {}
+        """Static metadata for each node of a path with the (sender, receiver) tuple as key"""
+
+        self.tx_port_indices: dict[tuple, List[int]] = {}
+        """Indices of the tx port nodes of a path with the (sender, receiver) tuple as key.
+        The answers for a whole path are computed at once with build_port_masks.
+        """
+
         for stream in streams:
-            self.stream_paths[stream.name] = nx.shortest_path(topology.G, stream.sender, stream.receiver)
-            self.stream_statistics[stream.name] = StreamStatistics(stream.name, self.stream_paths[stream.name], self.topology.G.nodes(data=True))
+            endpoints = (stream.sender, stream.receiver)
+            if endpoints not in self.path_meta:
+                path = self.stream_paths[stream.name]
+                path_idx = build_path_index(path)
+                parsed_path = parse_path(path)
+                rx_mask, tx_mask = build_port_masks(path)
+                self.path_meta[endpoints] = self._build_path_meta(path, path_idx, parsed_path, rx_mask)
+                self.tx_port_indices[endpoints] = np.flatnonzero(tx_mask).tolist()
+
+    def _get_path(self, sender: str, receiver: str) -> List[str]:
+        """Returns the shortest path between sender and receiver,
+        reusing an already calculated path if another stream has the same endpoints
+        """
+        if (sender, receiver) not in self._path_cache:
+            self._path_cache[(sender, receiver)] = nx.shortest_path(self.topology.G, sender, receiver)
+
+        return self._path_cache[(sender, receiver)]
+
+    def _are_synchronized(self, node1: str, node2: str) -> bool:
+        """Returns whether the given nodes are in the same sync domain,
+        reusing an already answered query for the same node pair
+        """
+        if (node1, node2) not in self._sync_cache:
+            self._sync_cache[(node1, node2)] = self.topology.are_synchronized(node1, node2)
+
+        return self._sync_cache[(node1, node2)]
+
+    def _build_path_meta(self, path: List[str], path_idx: dict, parsed_path: List[tuple], rx_mask: "np.ndarray") -> List[PathNodeMeta]:
+        """Collects the static data of each node on the given path once,
+        so the delay calculation does not have to query the topology again for every visit
+        """
+        all_nodes = self._node_data
+        path_meta = []
+
+        for index, node_name in enumerate(path):
+            node_data = all_nodes[node_name]
+            is_talker = "talker" in node_name
+            is_listener = "listener" in node_name
+
+            if node_data["forwarding_node"] or rx_mask[index]:
+                path_meta.append(PathNodeMeta(
+                    node_data=node_data,
+                    is_talker=is_talker,
+                    is_listener=is_listener,
+                    is_rx_port=not node_data["forwarding_node"]
+                ))
+                continue
+
+            forwarding_node_name = self.topology.get_forwarding_node_name_by_port(node_name)
+            ancestor_forwarding_node_name = get_ancestor_forwarding_node_name(path, node_index=index, path_idx=path_idx, parsed_path=parsed_path)
+            is_synchronized = self._are_synchronized(forwarding_node_name, ancestor_forwarding_node_name) if ancestor_forwarding_node_name is not None else True
+
+            port_params = PortParams(
+                gcl=node_data["gcl"],
+                gcl_cycle=node_data["gcl_cycle"],
+                gcl_open=node_data["gcl_open"],
+                gcl_offset=node_data["gcl_offset"],
+                gcl_mask=node_data["gcl_priorities_mask"],
+                frame_preemption=node_data["frame_preemption"],
+                express_mask=node_data["express_priorities_mask"],
+                sync_jitter=all_nodes[forwarding_node_name]["sync_jitter"]
+            )
+
+            path_meta.append(PathNodeMeta(
+                node_data=node_data,
+                is_talker=is_talker,
+                is_listener=is_listener,
+                forwarding_node_name=forwarding_node_name,
+                forwarding_node_data=all_nodes[forwarding_node_name],
+                ancestor_forwarding_node_name=ancestor_forwarding_node_name,
+                is_synchronized=is_synchronized,
+                edge_data=self.topology.G.get_edge_data(node_name, path[index+1]),
+                port_params=port_params
+            ))
+
+        return path_meta
 
     def get_crossing_streams(self, observed_stream_name: str, port_node_name: str) -> List[Stream]:
         """Returns streams that cross the same given port
         @param observed_stream_name Stream that is crossed by the other streams (is not added to the returned list)
         @param port_name Name of the port node (full name including forwarding node name)
         """
-        crossing_streams = [stream for stream in self.streams if port_node_name in self.stream_paths[stream.name] and stream.name != observed_stream_name]
+        crossing_streams = [stream for stream in self.streams_by_port.get(port_node_name, ()) if stream.name != observed_stream_name]
         return crossing_streams
 
     def get_interfering_streams(self, observed_stream: Stream, port_name: str) -> List[Stream]:
@@ -47,37 +244,54 @@ class Calculator:
         @param observed_stream Stream that is interfered by the other streams (is not added to the returned list)
         @param port_name Name of the port node
         """
-        express_priorities: ExpressPriorities = self.topology.G.nodes(data=True)[port_name]["express_priorities"]
-        crossing_streams = self.get_crossing_streams(observed_stream.name, port_name)
+        cached = self._interference_cache.get((observed_stream.name, port_name))
+        if cached is not None:
+            return cached
 
-        if observed_stream.priority in express_priorities:
-            interfering_streams = [
-                stream for stream in crossing_streams
-                    if stream.priority >= observed_stream.priority and stream.priority in express_priorities
-            ]
-        else:
-            interfering_streams = [
-                stream for stream in crossing_streams
-                    if stream.priority in express_priorities or stream.priority >= observed_stream.priority
+        key = (port_name, observed_stream.priority)
+        candidates = self._interference_candidates.get(key)
+
+        if candidates is None:
+            priority_buckets = self.port_priority_index.get(port_name, {})
+
+            express_mask = self._express_priorities_by_port[port_name]
+
+            # Priorities that are the same or higher than the observed priority
+            higher_mask = 0xFF & ~((1 << observed_stream.priority) - 1)
+
+            if (express_mask >> observed_stream.priority) & 1:
+                allowed_mask = express_mask & higher_mask
+            else:
+                allowed_mask = express_mask | higher_mask
+
+            candidates = [
+                stream for priority in sorted(priority_buckets) if (allowed_mask >> priority) & 1
+                    for stream in priority_buckets[priority]
             ]
+            self._interference_candidates[key] = candidates
 
+        interfering_streams = [stream for stream in candidates if stream.name != observed_stream.name]
+        self._interference_cache[(observed_stream.name, port_name)] = interfering_streams
         return interfering_streams
 
     def get_bandwidth(self, stream: Stream, node_name: str) -> int:
         """Returns the bandwidth in bytes of this stream on the given node.
         Ensure that the given node is no forwarding node
         """
-        if stream.name not in self.bandwidth_per_stream_and_node:
+        bandwidth_map = self.bandwidth_per_stream_and_node.get(stream.name)
+        if bandwidth_map is None:
             return stream.framesize
 
-        return self.bandwidth_per_stream_and_node[stream.name].get(node_name, stream.framesize)
+        return bandwidth_map.get(node_name, stream.framesize)
 
     def set_bandwidth(self, stream: Stream, node_name: str, bandwidth: int):
         """Set a new bandwidth for the given stream on the given node in bytes"""
         if self.get_bandwidth(stream, node_name) < bandwidth:
-            if stream.name not in self.bandwidth_per_stream_and_node:
-                self.bandwidth_per_stream_and_node[stream.name] = {}
-            self.bandwidth_per_stream_and_node[stream.name][node_name] = bandwidth
+            self.bandwidth_per_stream_and_node.setdefault(stream.name, {})[node_name] = bandwidth
+            # A changed bandwidth feeds into the interference delays of every
+            # stream sharing a port with this one, so all delays are stale now
+            self._delays_calculated.clear()
+            self._bandwidth_stable = False
 
     def get_new_bandwidth(self, stream: Stream, d_arriv: int, node_a: str = None, node_b: str = None, ct_a: int = None, ct_b: int = None) -> int:
         """Calculates the new bandwidth in bytes required in domain B if the stream flows from domain A (node_a) to domain B (node_b).
@@ -87,84 +301,195 @@ class Calculator:
         """
 
         if isinstance(node_a, str):
-            node_a_data: NodeAttrs = self.topology.G.nodes(data=True)[node_a]
+            node_a_data: NodeAttrs = self._node_data[node_a]
             ct_a = node_a_data["gcl_cycle"]
 
         if isinstance(node_b, str):
-            node_b_data: NodeAttrs = self.topology.G.nodes(data=True)[node_b]
+            node_b_data: NodeAttrs = self._node_data[node_b]
             ct_b = node_b_data["gcl_cycle"]
 
-        factor_arriv = ceil(d_arriv / ct_b)
-        factor_ct = ceil(ct_b / ct_a)
+        # -(-a // b) is ceil(a / b) without the float division and function call
+        factor_arriv = int(-(-d_arriv // ct_b))
+        factor_ct = int(-(-ct_b // ct_a))
         new_bandwidth = self.get_bandwidth(stream, node_a) * factor_arriv * factor_ct
         return new_bandwidth
 
-    def recalculate_bandwidth_for_stream(self, stream: Stream, stream_statistics: StreamStatistics):
-        """Calculates the new bandwidth of the given stream for each node on the path based on the already calculated best case and worst case delays"""
+    def _get_bandwidth_targets(self, stream: Stream) -> List[tuple]:
+        """Returns the (node_name, forwarding_node_name, ancestor_port_node_name, index) tuples of the
+        tx port nodes whose bandwidth has to be recalculated on the path of the given stream,
+        reusing the list if another stream has the same endpoints
+        """
+        endpoints = (stream.sender, stream.receiver)
+        if endpoints not in self._bandwidth_target_cache:
+            path = self.stream_paths[stream.name]
+            path_idx = build_path_index(path)
+            parsed_path = parse_path(path)
+            rx_mask, _ = build_port_masks(path)
+            all_nodes = self._node_data
+            targets = []
+
+            for index, node_name in enumerate(path):
+                node_data = all_nodes[node_name]
+
+                if index == 0 or node_data["forwarding_node"]:
+                    continue
+                if index == len(path)-1:
+                    break
+                if rx_mask[index]:
+                    continue
+
+                forwarding_node_name = get_ancestor_forwarding_node_name(path=path, node_index=index, path_idx=path_idx, parsed_path=parsed_path)
+                ancestor_port_node_name = get_ancestor_tx_port_node_name(path=path, node_index=index, path_idx=path_idx, parsed_path=parsed_path)
+
+                if ancestor_port_node_name is None and index != 1:
+                    continue
+
+                targets.append((node_name, forwarding_node_name, ancestor_port_node_name, index))
+
+            self._bandwidth_target_cache[endpoints] = targets
+
+        return self._bandwidth_target_cache[endpoints]
+
+    def recalculate_bandwidth_for_stream(self, stream: Stream, stream_statistics: StreamStatistics) -> bool:
+        """Calculates the new bandwidth of the given stream for each node on the path based on the already calculated best case and worst case delays
+
+        @returns Whether any bandwidth actually changed.
+        If so, the delays of all streams are marked as stale so that the next
+        calculate_delays call recalculates them: the interference delay of a
+        stream is computed from the bandwidths of the other streams on its
+        ports, so a per-stream invalidation would keep stale delays on
+        streams sharing a port with this one.
+        """
         debug(f'Recalculating bandwidth for stream {stream.name}')
 
-        path = self.stream_paths[stream.name]
-        all_nodes = self.topology.G.nodes(data=True)
+        targets = self._get_bandwidth_targets(stream)
+        all_nodes = self._node_data
+        changed = False
 
         debug(f"Old (already modified) bandwidth: {self.bandwidth_per_stream_and_node.get(stream.name, None)}")
-        for index, node_name in enumerate(path):
-            node_data = all_nodes[node_name]
-
-            if index == 0 or node_data["forwarding_node"]:
-                continue
-            if index == len(path)-1:
-                break
-            if is_rx_port(node_name, None, path):
-                continue
-
-            forwarding_node_name = get_ancestor_forwarding_node_name(path=self.stream_paths[stream.name], node_index=index)
-            ancestor_port_node_name = get_ancestor_tx_port_node_name(path=self.stream_paths[stream.name], node_index=index)
-
-            if ancestor_port_node_name is None and index != 1:
-                continue
-        
-            best_case_sum = stream_statistics.get_summarized_best_case(f'{forwarding_node_name}-tx')
-            worst_case_sum = stream_statistics.get_summarized_worst_case(f'{forwarding_node_name}-tx')
-            d_arriv = worst_case_sum - best_case_sum
-
-            if index == 1:
-                # In this case, there is no previous domain. Use stream cycle time instead
-                new_bandwidth = self.get_new_bandwidth(stream, d_arriv, None, node_name, ct_a=stream.cycletime)
-            else:
-                new_bandwidth = self.get_new_bandwidth(stream, d_arriv, ancestor_port_node_name, node_name)
-
-            self.set_bandwidth(stream, node_name, new_bandwidth)
+        if targets:
+            delays = stream_statistics.delays_per_port
+            best_case_sums = np.cumsum(stream_statistics.best_cases)
+            worst_case_sums = np.cumsum(stream_statistics.worst_cases)
+            last_index = {f'{statistics.node_name}-{statistics.port_name}-{statistics.direction}': index for index, statistics in enumerate(delays)}
+
+            stop_indices = np.fromiter(
+                (last_index.get(f'{forwarding_node_name}-tx', len(delays)-1) for _, forwarding_node_name, _, _ in targets),
+                dtype=np.intp, count=len(targets)
+            )
+            d_arriv = worst_case_sums[stop_indices] - best_case_sums[stop_indices]
+
+            ct_a = np.fromiter(
+                # If there is no previous domain (index 1), the stream cycle time is used instead
+                (stream.cycletime if index == 1 else all_nodes[ancestor_port_node_name]["gcl_cycle"] for _, _, ancestor_port_node_name, index in targets),
+                dtype=np.int64, count=len(targets)
+            )
+            ct_b = np.fromiter((all_nodes[node_name]["gcl_cycle"] for node_name, _, _, _ in targets), dtype=np.int64, count=len(targets))
+
+            # -(-a // b) is ceil(a / b), see get_new_bandwidth
+            factors = (-(-d_arriv // ct_b)).astype(np.int64) * -(-ct_b // ct_a)
+
+            # The writeback stays sequential: the bandwidth of a port depends on the
+            # (possibly just updated) bandwidth of the previous tx port on the path
+            for position, (node_name, _, ancestor_port_node_name, index) in enumerate(targets):
+                node_a = None if index == 1 else ancestor_port_node_name
+                new_bandwidth = self.get_bandwidth(stream, node_a) * int(factors[position])
+                if new_bandwidth != self.get_bandwidth(stream, node_name):
+                    changed = True
+                self.set_bandwidth(stream, node_name, new_bandwidth)
         debug(f"New (already modified) bandwidth: {self.bandwidth_per_stream_and_node.get(stream.name, None)}")
 
-    def recalculate_bandwidth(self, streams: List[str] = None):
+        if changed:
+            self._delays_calculated.clear()
+        return changed
+
+    def recalculate_bandwidth(self, streams: List[str] = None) -> bool:
         """
         @param streams Name of the streams for which the bandwidth should be calculated.
         Note: all streams that exist on the topology should be calculated
+
+        @returns Whether any bandwidth actually changed
         """
+        if streams is None and self._bandwidth_stable:
+            # The last full pass was a fixed point and the delays did not
+            # change since, so this pass cannot change anything either
+            return False
+
+        wanted = None if streams is None else frozenset(streams)
+        changed = False
+
         for stream in self.streams:
-            if streams is not None and len([s for s in streams if s == stream.name]) == 0:
+            if wanted is not None and stream.name not in wanted:
                 continue
 
-            self.recalculate_bandwidth_for_stream(stream, self.stream_statistics[stream.name])
+            if self.recalculate_bandwidth_for_stream(stream, self.stream_statistics[stream.name]):
+                changed = True
+
+        if streams is None:
+            self._bandwidth_stable = not changed
 
-    def get_stream_transmission_duration(self, stream: Stream, link_speed: int, node_name: str) -> int:
+        return changed
+
+    def recalculate_until_stable(self, streams: List[str] = None, max_iter: int = 2):
+        """Alternates bandwidth recalculation and delay calculation until the
+        reserved bandwidths reach a fixed point (or max_iter is exceeded).
+        Streams whose bandwidth did not change keep their delays, so a
+        converged model does not pay for another full delay pass.
+
+        @param streams Name of the streams that should be converged (all streams by default)
+        @param max_iter Maximum number of bandwidth/delay rounds.
+        Keep this small: the bandwidth recalculation is not guaranteed to
+        converge and the reserved bandwidths can grow with every round.
+        """
+        self.calculate_delays(streams)
+
+        for _ in range(max_iter):
+            if not self.recalculate_bandwidth(streams):
+                break
+            self.calculate_delays(streams)
+
+    def get_stream_transmission_duration(self, stream: Stream, link_speed_bytes: float, node_name: str) -> int:
         """Calculates transmission duration of the stream based on the link speed (including L1 overhead)
 
-        @link_speed Link speed in Mbit/s
+        @link_speed_bytes Link speed in bytes per second
 
         @returns Transmission duration in nanoseconds
         """
         # TODO: what was the reason to use the bandwidth here?
         framesize = self.get_bandwidth(stream, node_name) if node_name is not None else stream.framesize
-        return get_transmission_duration(framesize + 20, link_speed)
+        return get_transmission_duration(framesize + 20, link_speed_bytes)
 
     def calculate_delays_for_stream(self, stream: Stream):
+        """Calculates the best case and the worst case delay of the given stream
+        in a single walk over its path, so the per-port state is only touched once
+        for both bounds
+        """
         path = self.stream_paths[stream.name]
-        all_nodes = self.topology.G.nodes(data=True)
-        all_edges = self.topology.G.edges(data=True)
+        path_meta = self.path_meta[(stream.sender, stream.receiver)]
+
+        # Per-node state as preallocated SoA arrays (one row per traversed node, row 0 is the initial state).
+        # t1/t2 hold the beginning/end of the forwarding window, t3/t4 the accumulated best/worst case delay,
+        # ct the cycle time imposed by the last traversed TAS domain.
+        n_rows = len(path) + 1
+        node_names = ["init"]
+        bc_t1 = np.zeros(n_rows)
+        bc_t2 = np.zeros(n_rows)
+        bc_t3 = np.zeros(n_rows)
+        bc_t4 = np.zeros(n_rows)
+        wc_t1 = np.zeros(n_rows)
+        wc_t2 = np.zeros(n_rows)
+        wc_t3 = np.zeros(n_rows)
+        wc_t4 = np.zeros(n_rows)
+        wc_ct = np.zeros(n_rows)
+
+        bc_t1[0] = stream.offset
+        bc_t2[0] = stream.offset+stream.transmission_window
+        wc_t1[0] = stream.offset
+        wc_t2[0] = stream.offset+stream.transmission_window
+        wc_ct[0] = stream.cycletime
+        row = 1
+        """Index of the next row to fill (row-1 is the last filled row)"""
 
-        best_case = [("init", stream.offset, stream.offset+stream.transmission_window, 0, 0)]
-        worst_case = [("init", stream.offset, stream.offset+stream.transmission_window, 0, 0, stream.cycletime)]
         multiplication = []
 
         stream_statistics = self.stream_statistics[stream.name]
@@ -172,14 +497,12 @@ class Calculator:
         stream_statistics.clear_worst_case()
 
         for index, node_name in enumerate(path):
-            try:
-                port_statistics = stream_statistics.get_port_statistics(node_name)
-            except:
-                port_statistics = None
+            port_statistics = stream_statistics.port_statistics_map.get(node_name)
 
-            node_data = all_nodes[node_name]
+            meta = path_meta[index]
+            node_data = meta.node_data
 
-            if is_rx_port(node_name, None, path):
+            if meta.is_rx_port:
                 multiplication.append(1)
                 continue
 
@@ -190,21 +513,36 @@ class Calculator:
                 d_proc_wc = d_proc + node_data["processing_jitter"]
 
                 multiplication.append(1)
-                best_case.append((node_name, best_case[-1][1]+d_proc_bc, best_case[-1][2]+d_proc_bc, best_case[-1][3]+d_proc_bc, best_case[-1][4]+d_proc_bc))
-                worst_case.append((node_name, worst_case[-1][1]+d_proc_wc, worst_case[-1][2]+d_proc_wc, worst_case[-1][3]+d_proc_wc, worst_case[-1][3]+d_proc_wc, 0))
+                bc_t1[row] = bc_t1[row-1]+d_proc_bc
+                bc_t2[row] = bc_t2[row-1]+d_proc_bc
+                bc_t3[row] = bc_t3[row-1]+d_proc_bc
+                bc_t4[row] = bc_t4[row-1]+d_proc_bc
+                wc_t1[row] = wc_t1[row-1]+d_proc_wc
+                wc_t2[row] = wc_t2[row-1]+d_proc_wc
+                wc_t3[row] = wc_t3[row-1]+d_proc_wc
+                wc_t4[row] = wc_t3[row-1]+d_proc_wc
+                wc_ct[row] = 0
             else:
-                forwarding_node_name = self.topology.get_forwarding_node_name_by_port(node_name)
-                forwarding_node_data = all_nodes[forwarding_node_name]
-                edge = self.topology.G.get_edge_data(node_name, path[index+1])
-                ancestor_forwarding_node_name = get_ancestor_forwarding_node_name(path, node_index=index)
-                is_synchronized = self.topology.are_synchronized(forwarding_node_name, ancestor_forwarding_node_name) if ancestor_forwarding_node_name is not None else True
+                # Cache the port attributes in locals once, the equations below read them many times
+                port_params = meta.port_params
+                gcl_enabled = port_params.gcl
+                gcl_cycle = port_params.gcl_cycle
+                gcl_open = port_params.gcl_open
+                gcl_offset = port_params.gcl_offset
+                gcl_mask = port_params.gcl_mask
+                frame_preemption = port_params.frame_preemption
+                express_mask = port_params.express_mask
+                sync_jitter = port_params.sync_jitter
+
+                edge = meta.edge_data
+                is_synchronized = meta.is_synchronized
 
 
                 # Section 5.2.2 Propagation Delay
                 d_prop = edge["propagation_delay"]
 
                 # Section 5.2.3 Transmission Delay
-                d_trans = self.get_stream_transmission_duration(stream, edge["link_speed"], None)
+                d_trans = self.get_stream_transmission_duration(stream, edge["link_speed_bytes"], None)
                 d_trans_bc = d_trans - edge["transmission_jitter"] + d_prop
                 d_trans_wc = d_trans + edge["transmission_jitter"] + d_prop
 
@@ -214,82 +552,87 @@ class Calculator:
                 interfering_streams = [s for s in interfering_streams if s.priority >= stream.priority]
 
                 # Equation 2
-                if node_data["frame_preemption"]:
-                    express_priorities = node_data["express_priorities"]
-                    if len(express_priorities) != 0:
-                        interfering_streams = [s for s in interfering_streams if s.priority in express_priorities]
+                if frame_preemption:
+                    if express_mask != 0:
+                        interfering_streams = [s for s in interfering_streams if (express_mask >> s.priority) & 1]
 
                 # Equation 3
-                if node_data["gcl"]:
-                    gcl_priorities = node_data["gcl_priorities"]
-                    if len(gcl_priorities) != 0:
-                        interfering_streams = [s for s in interfering_streams if s.priority in gcl_priorities]
+                if gcl_enabled:
+                    if gcl_mask != 0:
+                        interfering_streams = [s for s in interfering_streams if (gcl_mask >> s.priority) & 1]
                 
                 # Equation 4
                 # TODO: different cycle times!!
-                interfering_streams_delays = [self.get_stream_transmission_duration(s, edge["link_speed"], node_name) + edge["transmission_jitter"] for s in interfering_streams]
+                interfering_framesizes = np.fromiter(
+                    (self.get_bandwidth(s, node_name) + 20 for s in interfering_streams),
+                    dtype=np.int64, count=len(interfering_streams)
+                )
+                interfering_streams_delays = get_transmission_durations(interfering_framesizes, edge["link_speed_bytes"]) + edge["transmission_jitter"]
                 # do not assume interference on the sender
                 # TODO: handle talker with index of node
-                d_interference = sum(interfering_streams_delays) if "talker" not in node_name else 0
+                d_interference = interfering_streams_delays.sum() if not meta.is_talker else 0
 
                 # Equations 15 and 17
-                d_interference *= ceil(worst_case[-2][5]/stream.cycletime)
+                d_interference *= int(-(-wc_ct[row-2] // stream.cycletime))
 
 
                 # Section 5.2.5 Blocking Delay 
                 # calculate blocking delay (including L1 overhead, beacause the used function does not add the L1 overhead itself)
-                if node_data["frame_preemption"]:
-                    express_priorities = node_data["express_priorities"]
-                else:
-                    express_priorities = []
+                if not frame_preemption:
+                    express_mask = 0
 
-                if node_data["gcl"]:
-                    gcl_priorities = node_data["gcl_priorities"]
-                else:
-                    gcl_priorities = [0, 1, 2, 3, 4, 5, 6, 7]
+                if not gcl_enabled:
+                    gcl_mask = 0xFF
 
-                if stream.priority in express_priorities:
+                if (express_mask >> stream.priority) & 1:
                     blck_bytes = 123 + 20
                 else:
                     blck_bytes = edge["max_frame_size"] + 20
-                    
-                if len([_ for _ in gcl_priorities if _ < stream.priority]) == 0:
+
+                # no blocking if no priority lower than the stream priority passes the gate
+                if (gcl_mask & ((1 << stream.priority) - 1)) == 0:
                     blck_bytes = 0
                     
                 # do not assume blocking on the sender
                 # TODO: handle talker with index of node
-                d_blck = get_transmission_duration(blck_bytes, edge["link_speed"]) if "talker" not in node_name else 0
+                d_blck = get_transmission_duration(blck_bytes, edge["link_speed_bytes"]) if not meta.is_talker else 0
                 
 
                 # Equation 8 + influence of changing cycle time
-                #d_dwell = d_trans_wc + d_blck + d_interference + max(0, worst_case[-2][5]-node_data["gcl_cycle"])
-                d_dwell = d_trans_wc + d_blck + max(0, worst_case[-2][5]-node_data["gcl_cycle"])
+                #d_dwell = d_trans_wc + d_blck + d_interference + max(0, wc_ct[row-2]-gcl_cycle)
+                ct_gap = wc_ct[row-2]-gcl_cycle
+                d_dwell = d_trans_wc + d_blck + (ct_gap if ct_gap > 0 else 0)
                 
                 
-                if node_data["gcl"]:
-                    multiplication.append(node_data["gcl_cycle"]/max(1, worst_case[-2][5]))
+                if gcl_enabled:
+                    prev_ct = wc_ct[row-2]
+                    multiplication.append(gcl_cycle/(prev_ct if prev_ct > 1 else 1))
                 else:
                     multiplication.append(1)
                     
                 
                 # TAS
-                if node_data["gcl"]:
+                if gcl_enabled:
                     
                     # synchronized and domain before also was a TAS domain
-                    if is_synchronized and best_case[-1][1] != -1:
+                    if is_synchronized and bc_t1[row-1] != -1:
                         # best case scenario
+                        # position of the beginning/end of the transmission window within the GCL cycle
+                        bc_1_in_cycle = bc_t1[row-1] % gcl_cycle
+                        bc_2_in_cycle = bc_t2[row-1] % gcl_cycle
+
                         ## is the beginning of the transmission window before the gate open?
-                        early_1 = node_data["gcl_offset"] - (best_case[-1][1] % node_data["gcl_cycle"])
-                        early_2 = node_data["gcl_offset"] - (best_case[-1][2])# % node_data["gcl_cycle"])
+                        early_1 = gcl_offset - bc_1_in_cycle
+                        early_2 = gcl_offset - (bc_t2[row-1])# % gcl_cycle)
                         ## how much space is left after the beginning of the transmission window in the TAS window?
-                        remaining_1 = (node_data["gcl_offset"]+node_data["gcl_open"]) - (best_case[-1][1] % node_data["gcl_cycle"])
+                        remaining_1 = (gcl_offset+gcl_open) - bc_1_in_cycle
                         ## how much space is left after the end of the transmission window in the TAS window?
-                        remaining_2 = (node_data["gcl_offset"]+node_data["gcl_open"]) - (best_case[-1][2] % node_data["gcl_cycle"])
+                        remaining_2 = (gcl_offset+gcl_open) - bc_2_in_cycle
 
                         # is the beginning before the TAS open?
                         if early_1 >= 0:
                             if early_2 >= 0:
-                                ##best_case.append((node_name, best_case[-1][1]+early_1+d_trans_bc, best_case[-1][2]+early_2+d_trans_bc, best_case[-1][3]+early_1+d_trans_bc-forwarding_node_data["sync_jitter"], best_case[-1][4]+early_2+d_trans_bc-forwarding_node_data["sync_jitter"]))
+                                ##best_case.append((node_name, bc_t1[row-1]+early_1+d_trans_bc, bc_t2[row-1]+early_2+d_trans_bc, bc_t3[row-1]+early_1+d_trans_bc-sync_jitter, bc_t4[row-1]+early_2+d_trans_bc-sync_jitter))
                                 d_gate_1 = early_1
                                 d_gate_2 = early_2
                                 
@@ -302,14 +645,14 @@ class Calculator:
                                 
                                 offset_correction_1 = 0
                                 offset_correction_2 = 0
-                                ##best_case.append((node_name, best_case[-1][1]+early_1+d_trans_bc, best_case[-1][2]+d_trans_bc, best_case[-1][3]+early_1+d_trans_bc-forwarding_node_data["sync_jitter"], best_case[-1][4]+d_trans_bc-forwarding_node_data["sync_jitter"]))
+                                ##best_case.append((node_name, bc_t1[row-1]+early_1+d_trans_bc, bc_t2[row-1]+d_trans_bc, bc_t3[row-1]+early_1+d_trans_bc-sync_jitter, bc_t4[row-1]+d_trans_bc-sync_jitter))
                             else:
                                 d_gate_1 = early_1
                                 d_gate_2 = 0
                                 
                                 offset_correction_1 = 0
                                 offset_correction_2 = -1*remaining_2
-                                ##best_case.append((node_name, best_case[-1][1]+early_1+d_trans_bc, best_case[-1][2]+remaining_2, best_case[-1][3]+early_1+d_trans_bc-forwarding_node_data["sync_jitter"], best_case[-1][4]+remaining_2-forwarding_node_data["sync_jitter"]))
+                                ##best_case.append((node_name, bc_t1[row-1]+early_1+d_trans_bc, bc_t2[row-1]+remaining_2, bc_t3[row-1]+early_1+d_trans_bc-sync_jitter, bc_t4[row-1]+remaining_2-sync_jitter))
                         else:
                             # is the complete transmission window within the TAS window?
                             if remaining_1 >= d_trans_bc and remaining_2 >= d_trans_bc:
@@ -318,7 +661,7 @@ class Calculator:
                                 
                                 offset_correction_1 = 0
                                 offset_correction_2 = 0                              
-                                ##best_case.append((node_name, best_case[-1][1]+d_trans_bc, best_case[-1][2]+d_trans_bc, best_case[-1][3]+d_trans_bc-forwarding_node_data["sync_jitter"], best_case[-1][4]+d_trans_bc-forwarding_node_data["sync_jitter"]))
+                                ##best_case.append((node_name, bc_t1[row-1]+d_trans_bc, bc_t2[row-1]+d_trans_bc, bc_t3[row-1]+d_trans_bc-sync_jitter, bc_t4[row-1]+d_trans_bc-sync_jitter))
                             # is only the beginning of the transmission window in the TAS window?
                             elif remaining_1 >= d_trans_bc:
                                 d_gate_1 = 0
@@ -326,7 +669,7 @@ class Calculator:
                                 
                                 offset_correction_1 = 0
                                 offset_correction_2 = 0                            
-                                ##best_case.append((node_name, best_case[-1][1]+d_trans_bc, best_case[-1][2]+remaining_2, best_case[-1][3]+d_trans_bc-forwarding_node_data["sync_jitter"], best_case[-1][4]+d_trans_bc-forwarding_node_data["sync_jitter"]))
+                                ##best_case.append((node_name, bc_t1[row-1]+d_trans_bc, bc_t2[row-1]+remaining_2, bc_t3[row-1]+d_trans_bc-sync_jitter, bc_t4[row-1]+d_trans_bc-sync_jitter))
                             else:
                                 d_gate_1 = 0
                                 d_gate_2 = 0  
@@ -334,64 +677,74 @@ class Calculator:
                                 offset_correction_1 = 0
                                 offset_correction_2 = 0                              
                                 # we miss the gate, so we calculate how long we need to wait until the end of this cycle
-                                remaining_time_in_cycle_1 = node_data["gcl_cycle"]-(best_case[-1][1] % node_data["gcl_cycle"])
-                                remaining_time_in_cycle_2 = node_data["gcl_cycle"]-(best_case[-1][2] % node_data["gcl_cycle"])
+                                remaining_time_in_cycle_1 = gcl_cycle-bc_1_in_cycle
+                                remaining_time_in_cycle_2 = gcl_cycle-bc_2_in_cycle
                                 # transmit in the beginning of the next cycle --> window shrinks to size 0
-                                ##best_case.append((node_name, best_case[-1][1]+remaining_time_in_cycle_1+node_data["gcl_offset"]+d_trans_bc, best_case[-1][2]+remaining_time_in_cycle_2+node_data["gcl_offset"]+d_trans_bc, best_case[-1][3]+remaining_time_in_cycle_1+node_data["gcl_offset"]+d_trans_bc, best_case[-1][4]+remaining_time_in_cycle_2+node_data["gcl_offset"]+d_trans_bc))
+                                ##best_case.append((node_name, bc_t1[row-1]+remaining_time_in_cycle_1+gcl_offset+d_trans_bc, bc_t2[row-1]+remaining_time_in_cycle_2+gcl_offset+d_trans_bc, bc_t3[row-1]+remaining_time_in_cycle_1+gcl_offset+d_trans_bc, bc_t4[row-1]+remaining_time_in_cycle_2+gcl_offset+d_trans_bc))
                         
                         
                         
                         
                         # Equation 13
-                        d_forward_1 = d_gate_1+d_trans_bc-forwarding_node_data["sync_jitter"]
-                        d_forward_2 = d_gate_2+d_trans_bc-forwarding_node_data["sync_jitter"]
-                        best_case.append((node_name, best_case[-1][1]+d_forward_1+offset_correction_1, best_case[-1][2]+d_forward_2+offset_correction_2, best_case[-1][3]+d_forward_1, best_case[-1][4]+d_forward_2))
+                        d_forward_1 = d_gate_1+d_trans_bc-sync_jitter
+                        d_forward_2 = d_gate_2+d_trans_bc-sync_jitter
+                        bc_t1[row] = bc_t1[row-1]+d_forward_1+offset_correction_1
+                        bc_t2[row] = bc_t2[row-1]+d_forward_2+offset_correction_2
+                        bc_t3[row] = bc_t3[row-1]+d_forward_1
+                        bc_t4[row] = bc_t4[row-1]+d_forward_2
 
                                 
                                 
                                 
                         # worst case scenario TAS
+                        # position of the beginning/end of the transmission window within the GCL cycle
+                        wc_1_in_cycle = wc_t1[row-1] % gcl_cycle
+                        wc_2_in_cycle = wc_t2[row-1] % gcl_cycle
 
                         ## is the beginning of the transmission window after the gate close?
-                        late_1 = (node_data["gcl_offset"]+node_data["gcl_open"] - (worst_case[-1][1] % node_data["gcl_cycle"]))
+                        late_1 = (gcl_offset+gcl_open - wc_1_in_cycle)
                         ## is the end of the transmission window after the gate close?
-                        late_2 = (node_data["gcl_offset"]+node_data["gcl_open"] - (worst_case[-1][2] % node_data["gcl_cycle"]))
+                        late_2 = (gcl_offset+gcl_open - wc_2_in_cycle)
 
                         ## is the beginning of the transmission window before the gate open?
-                        early_1 = (node_data["gcl_offset"] - (worst_case[-1][1] % node_data["gcl_cycle"]))
+                        early_1 = (gcl_offset - wc_1_in_cycle)
                         ## is the end of the transmission window before the gate open?
-                        early_2 = (node_data["gcl_offset"] - (worst_case[-1][2] % node_data["gcl_cycle"]))
+                        early_2 = (gcl_offset - wc_2_in_cycle)
 
                         # is the end after the TAS close?
                         #if late_1 >= d_trans_wc and late_2 >= d_trans:
                         tmp = (d_trans+d_blck+d_interference)
+                        # how much of the previous (longer) cycle is left after one gate cycle
+                        cycle_gap = gcl_cycle-wc_ct[row-2]
+                        if cycle_gap < 0:
+                            cycle_gap = 0
                         if late_1 < tmp and late_2 < tmp:
                             # Equation 11 case 'otherwise' for the beginning of the transmission window
-                            d_gate_1 = node_data["gcl_cycle"]-(worst_case[-1][1] % node_data["gcl_cycle"])+node_data["gcl_open"]
+                            d_gate_1 = gcl_cycle-wc_1_in_cycle+gcl_open
                             # Equation 11 case 'otherwise' for the end of the transmission window
-                            d_gate_2 = node_data["gcl_cycle"]-(worst_case[-1][2] % node_data["gcl_cycle"])+node_data["gcl_open"]
+                            d_gate_2 = gcl_cycle-wc_2_in_cycle+gcl_open
 
                             # Equation 13
                             ##d_forward_1 = d_gate_1+d_trans+d_blck+d_interference
                             ##d_forward_2 = d_gate_2+d_trans+d_blck+d_interference
 
-                            ##worst_case.append((node_name, worst_case[-1][1]+d_forward_1, worst_case[-1][2]+d_forward_2, worst_case[-1][3]+d_forward_1, worst_case[-1][4]+d_forward_2, node_data["gcl_cycle"]))
+                            ##worst_case.append((node_name, wc_t1[row-1]+d_forward_1, wc_t2[row-1]+d_forward_2, wc_t3[row-1]+d_forward_1, wc_t4[row-1]+d_forward_2, gcl_cycle))
 
                         elif late_2 < tmp:
                             # we miss the gate, so we calculate how long we need to wait
-                            d_gate_1 = 0#node_data["gcl_cycle"]-(worst_case[-1][1] % node_data["gcl_cycle"])
+                            d_gate_1 = 0#gcl_cycle-(wc_t1[row-1] % gcl_cycle)
 
                             # Equation 11 case 'otherwise' for the end of the transmission window (additionally assume any transmission in the transmission window to be a longer worst-case)
-                            d_gate_unsync = node_data["gcl_cycle"]-node_data["gcl_open"]+d_trans+(d_interference/max(1,len(interfering_streams)))
-                            d_gate_2 = d_gate_unsync  + max(0, node_data["gcl_cycle"]-worst_case[-2][5]) #max(d_gate_unsync, node_data["gcl_cycle"]-(worst_case[-1][2] % node_data["gcl_cycle"]))
-                            #d_gate_2 = node_data["gcl_cycle"]-(node_data["gcl_cycle"] % node_data["gcl_cycle"]))
-                            #d_gate_2 = node_data["gcl_cycle"]-(worst_case[-1][2] % node_data["gcl_cycle"])
+                            d_gate_unsync = gcl_cycle-gcl_open+d_trans+(d_interference/max(1,len(interfering_streams)))
+                            d_gate_2 = d_gate_unsync  + cycle_gap #max(d_gate_unsync, gcl_cycle-(wc_t2[row-1] % gcl_cycle))
+                            #d_gate_2 = gcl_cycle-(gcl_cycle % gcl_cycle))
+                            #d_gate_2 = gcl_cycle-(wc_t2[row-1] % gcl_cycle)
 
                             # Equation 13
                             ##d_forward_1 = d_gate_1+d_trans+d_blck#+d_interference
                             ##d_forward_2 = d_gate_2+d_trans+d_blck#+d_interference
                             
-                            ##worst_case.append((node_name, worst_case[-1][1]+d_forward_1, worst_case[-1][2]+d_forward_2, worst_case[-1][3]+d_forward_1, worst_case[-1][4]+d_forward_2, node_data["gcl_cycle"]))
+                            ##worst_case.append((node_name, wc_t1[row-1]+d_forward_1, wc_t2[row-1]+d_forward_2, wc_t3[row-1]+d_forward_1, wc_t4[row-1]+d_forward_2, gcl_cycle))
                         elif early_2 >= 0:
                             # Equation 11 case 'C1' for the beginning of the transmission window
                             d_gate_1 = early_1
@@ -399,7 +752,7 @@ class Calculator:
                             d_gate_2 = early_2
                             ##d_forward_1 = d_gate_1+d_trans+d_blck+d_interference
                             ##d_forward_2 = d_gate_2+d_trans+d_blck+d_interference
-                            ##worst_case.append((node_name, worst_case[-1][1]d_forward_1, worst_case[-1][2]+d_forward_2, worst_case[-1][3]+d_forward_1, worst_case[-1][4]+d_forward_2, node_data["gcl_cycle"]))
+                            ##worst_case.append((node_name, wc_t1[row-1]d_forward_1, wc_t2[row-1]+d_forward_2, wc_t3[row-1]+d_forward_1, wc_t4[row-1]+d_forward_2, gcl_cycle))
                         elif early_1 >= 0:
                             # Equation 11 case 'C1' for the beginning of the transmission window
                             d_gate_1 = early_1
@@ -407,177 +760,257 @@ class Calculator:
                             d_gate_2 = 0
                             ##d_forward_1 = d_gate_1+d_trans+d_blck+d_interference
                             ##d_forward_2 = d_gate_2+d_trans+d_blck+d_interference
-                            ##worst_case.append((node_name, worst_case[-1][1]+d_forward_1, worst_case[-1][2]+d_forward_2, worst_case[-1][3]+d_forward_1, worst_case[-1][4]+d_forward_2, node_data["gcl_cycle"]))
+                            ##worst_case.append((node_name, wc_t1[row-1]+d_forward_1, wc_t2[row-1]+d_forward_2, wc_t3[row-1]+d_forward_1, wc_t4[row-1]+d_forward_2, gcl_cycle))
                         else:
                             # Equation 11 case 'C2' 
                             d_gate_1 = 0
                             d_gate_2 = 0
                             ##d_forward_1 = d_gate_1+d_trans+d_blck+d_interference
                             ##d_forward_2 = d_gate_2+d_trans+d_blck+d_interference
-                            #worst_case.append((node_name, worst_case[-1][1]+d_dwell+d_interference, worst_case[-1][2]+d_dwell+d_interference, worst_case[-1][3]+d_dwell+d_interference, worst_case[-1][4]+d_dwell+d_interference, node_data["gcl_cycle"]))
-                            ##worst_case.append((node_name, worst_case[-1][1]+d_forward_1, worst_case[-1][2]+d_forward_2, worst_case[-1][3]+d_forward_1, worst_case[-1][4]+d_forward_2, node_data["gcl_cycle"]))
+                            #worst_case.append((node_name, wc_t1[row-1]+d_dwell+d_interference, wc_t2[row-1]+d_dwell+d_interference, wc_t3[row-1]+d_dwell+d_interference, wc_t4[row-1]+d_dwell+d_interference, gcl_cycle))
+                            ##worst_case.append((node_name, wc_t1[row-1]+d_forward_1, wc_t2[row-1]+d_forward_2, wc_t3[row-1]+d_forward_1, wc_t4[row-1]+d_forward_2, gcl_cycle))
                             
                         
                         # Equation 13
-                        d_forward_1 = d_gate_1+d_trans+d_blck+d_interference+forwarding_node_data["sync_jitter"]+ max(0, node_data["gcl_cycle"]-worst_case[-2][5])
-                        d_forward_2 = d_gate_2+d_trans+d_blck+d_interference+forwarding_node_data["sync_jitter"]+ max(0, node_data["gcl_cycle"]-worst_case[-2][5])
-                        worst_case.append((node_name, worst_case[-1][1]+d_forward_1, worst_case[-1][2]+d_forward_2, worst_case[-1][3]+d_forward_1, worst_case[-1][4]+d_forward_2, node_data["gcl_cycle"]))
+                        d_forward_1 = d_gate_1+d_trans+d_blck+d_interference+sync_jitter+cycle_gap
+                        d_forward_2 = d_gate_2+d_trans+d_blck+d_interference+sync_jitter+cycle_gap
+                        wc_t1[row] = wc_t1[row-1]+d_forward_1
+                        wc_t2[row] = wc_t2[row-1]+d_forward_2
+                        wc_t3[row] = wc_t3[row-1]+d_forward_1
+                        wc_t4[row] = wc_t4[row-1]+d_forward_2
+                        wc_ct[row] = gcl_cycle
+
+
 
-                            
-                            
                             
                     # unsynchronized TAS
                     else:
                         # is the transmission window larger than the TAS window?
-                        exceeding = (best_case[-1][2] - best_case[-1][1]) - node_data["gcl_open"]
-                        gcl_open = node_data["gcl_offset"]
-                        gcl_close = node_data["gcl_offset"]+node_data["gcl_open"]
+                        exceeding = (bc_t2[row-1] - bc_t1[row-1]) - gcl_open
+                        gate_open = gcl_offset
+                        gate_close = gcl_offset+gcl_open
+                        bc_t1[row] = gate_open
+                        bc_t2[row] = gate_close
+                        bc_t3[row] = bc_t3[row-1]+d_trans_bc
                         if exceeding > 0:
                             # end of the window is too late, so we can max have an end at latest gate open
-                            best_case.append((node_name, gcl_open, gcl_close, best_case[-1][3]+d_trans_bc, best_case[-1][4]+d_trans_bc+exceeding))
+                            bc_t4[row] = bc_t4[row-1]+d_trans_bc+exceeding
                         else:
                             # delay is increased by transmission only
-                            best_case.append((node_name, gcl_open, gcl_close, best_case[-1][3]+d_trans_bc, best_case[-1][4]+d_trans_bc))
+                            bc_t4[row] = bc_t4[row-1]+d_trans_bc
 
-                        d_gate = node_data["gcl_cycle"]-node_data["gcl_open"]+d_trans+(d_interference/max(1,len(interfering_streams)))
+                        d_gate = gcl_cycle-gcl_open+d_trans+(d_interference/max(1,len(interfering_streams)))
                         d_forward = d_gate+d_dwell#+d_trans+d_blck+d_interference
-                        worst_case.append((node_name, gcl_open, gcl_close, worst_case[-1][3]+d_forward, worst_case[-1][4]+d_forward, node_data["gcl_cycle"]))
-                        #worst_case.append((node_name, gcl_open, gcl_close, worst_case[-1][3]+d_gate+d_dwell, worst_case[-1][4]+d_gate+d_dwell, node_data["gcl_cycle"]))
+                        wc_t1[row] = gate_open
+                        wc_t2[row] = gate_close
+                        wc_t3[row] = wc_t3[row-1]+d_forward
+                        wc_t4[row] = wc_t4[row-1]+d_forward
+                        wc_ct[row] = gcl_cycle
 
                         
                         
                         
                 # SP and FP
                 else:
-                    if is_synchronized and best_case[-1][1] != -1:
+                    if is_synchronized and bc_t1[row-1] != -1:
                         # we only want to cover synchronized SP and FP after a TAS window, Sp and FP after Sp and FP are in the else branch
-                        best_case.append((node_name, best_case[-1][1]+d_trans_bc, best_case[-1][2]+d_trans_bc, best_case[-1][3]+d_trans_bc, best_case[-1][4]+d_trans_bc))
-                        worst_case.append((node_name, worst_case[-1][1]+d_dwell+d_interference, worst_case[-1][2]+d_dwell+d_interference, worst_case[-1][3]+d_dwell+d_interference, worst_case[-1][4]+d_dwell+d_interference, worst_case[-2][5]))
+                        bc_t1[row] = bc_t1[row-1]+d_trans_bc
+                        bc_t2[row] = bc_t2[row-1]+d_trans_bc
+                        bc_t3[row] = bc_t3[row-1]+d_trans_bc
+                        bc_t4[row] = bc_t4[row-1]+d_trans_bc
+                        wc_t1[row] = wc_t1[row-1]+d_dwell+d_interference
+                        wc_t2[row] = wc_t2[row-1]+d_dwell+d_interference
+                        wc_t3[row] = wc_t3[row-1]+d_dwell+d_interference
+                        wc_t4[row] = wc_t4[row-1]+d_dwell+d_interference
+                        wc_ct[row] = wc_ct[row-2]
                         
                     else:
                         # -1 indicates, that there was an unsync transmission and this node did not put restrictions on the transmission windo --> for next tas node: behave as if unsynchronized
-                        best_case.append((node_name, -1, worst_case[-2][5]-(d_trans_wc*3), best_case[-1][3]+d_trans_bc, best_case[-1][4]+d_trans_bc))
-                        worst_case.append((node_name, -1, worst_case[-2][5]-(d_trans_wc*3), worst_case[-1][3]+d_dwell+d_interference, worst_case[-1][4]+d_dwell+d_interference, worst_case[-2][5]))
+                        bc_t1[row] = -1
+                        bc_t2[row] = wc_ct[row-2]-(d_trans_wc*3)
+                        bc_t3[row] = bc_t3[row-1]+d_trans_bc
+                        bc_t4[row] = bc_t4[row-1]+d_trans_bc
+                        wc_t1[row] = -1
+                        wc_t2[row] = wc_ct[row-2]-(d_trans_wc*3)
+                        wc_t3[row] = wc_t3[row-1]+d_dwell+d_interference
+                        wc_t4[row] = wc_t4[row-1]+d_dwell+d_interference
+                        wc_ct[row] = wc_ct[row-2]
 
                     
             # if the end of the forwarding window moved before the beginning, we set the window size to 0
-            if best_case[-1][2] < best_case[-1][1]:
-                best_case[-1] = (best_case[-1][0], best_case[-1][1], best_case[-1][1], best_case[-1][3], best_case[-1][4])
-            #if best_case[-1][4] < best_case[-1][3]:
-            #    best_case[-1] = (best_case[-1][0], best_case[-1][1], best_case[-1][2], best_case[-1][3], best_case[-1][3])
-            if "talker" in node_name or "listener" in node_name:
-                best_case[-1] = (best_case[-1][0], best_case[-1][1], best_case[-1][2], best_case[-2][3], best_case[-2][4])
-                worst_case[-1] = (worst_case[-1][0], worst_case[-1][1], worst_case[-1][2], worst_case[-2][3], worst_case[-2][4], worst_case[-1][5])
+            if bc_t2[row] < bc_t1[row]:
+                bc_t2[row] = bc_t1[row]
+            if meta.is_talker or meta.is_listener:
+                bc_t3[row] = bc_t3[row-1]
+                bc_t4[row] = bc_t4[row-1]
+                wc_t3[row] = wc_t3[row-1]
+                wc_t4[row] = wc_t4[row-1]
 
             if port_statistics is not None:
-                #port_statistics.best_case = min(best_case[-1][3], best_case[-1][4])-min(best_case[-2][3], best_case[-2][4])
-                #port_statistics.worst_case = max(worst_case[-1][3], worst_case[-1][4])-max(worst_case[-2][3], worst_case[-2][4])
-                port_statistics.best_case = min(best_case[-1][3], best_case[-1][4])#-min(best_case[-2][3], best_case[-2][4])
-                port_statistics.worst_case = max(worst_case[-1][3], worst_case[-1][4])#-max(worst_case[-2][3], worst_case[-2][4])
-
-        debug("BC: ", min(best_case[-2][3], best_case[-2][4]))
-        debug("WC: ", max(worst_case[-2][3], worst_case[-2][4]))
+                bc_3 = bc_t3[row]
+                bc_4 = bc_t4[row]
+                wc_3 = wc_t3[row]
+                wc_4 = wc_t4[row]
+                # a if a < b else b skips the call machinery of min()/max() for the 2-element case
+                port_statistics.best_case = float(bc_3 if bc_3 < bc_4 else bc_4)
+                port_statistics.worst_case = float(wc_3 if wc_3 > wc_4 else wc_4)
+
+            node_names.append(node_name)
+            row += 1
+
+        final_best = bc_t3[row-2] if bc_t3[row-2] < bc_t4[row-2] else bc_t4[row-2]
+        final_worst = wc_t3[row-2] if wc_t3[row-2] > wc_t4[row-2] else wc_t4[row-2]
+        debug("BC: ", final_best)
+        debug("WC: ", final_worst)
         stream.saved_multiplications = multiplication
-        return best_case, worst_case, min(best_case[-2][3], best_case[-2][4]), max(worst_case[-2][3], worst_case[-2][4])
+        self._delays_calculated.add(stream.name)
+        # Fresh delays can change the bandwidth recalculation inputs
+        self._bandwidth_stable = False
+        best_case = (node_names, bc_t1, bc_t2, bc_t3, bc_t4)
+        worst_case = (node_names, wc_t1, wc_t2, wc_t3, wc_t4, wc_ct)
+        return best_case, worst_case, final_best, final_worst
+
+    def _calculate_delays_worker(self, stream_name: str):
+        """Calculates the delays of one stream in a worker process.
+        Returns the per-stream state that has to be merged back into the parent process,
+        because the worker only operates on a copy of the calculator.
+        """
+        stream = next(s for s in self.streams if s.name == stream_name)
+        self.calculate_delays_for_stream(stream)
+        statistics = self.stream_statistics[stream_name]
+        return statistics.best_cases, statistics.worst_cases, stream.saved_multiplications
 
-    def calculate_delays(self, streams: List[str] = None):
+    def calculate_delays(self, streams: List[str] = None, max_workers: int = 1):
         """
         @param streams Name of the streams for which the best case should be calculated.
         Note: all streams that exist on the topology should be calculated
-        """
-        for stream in self.streams:
-            if streams is not None and len([s for s in streams if s == stream.name]) == 0:
-                continue
+        @param max_workers Number of worker processes used to calculate streams in parallel.
+        The streams are independent of each other, so this scales with the number of cores.
+        The default stays in-process, which is faster for models with only a few streams.
 
+        Streams whose delays are already calculated and whose bandwidth did not
+        change since then are skipped.
+        """
+        streams_set = None if streams is None else frozenset(streams)
+        wanted = [
+            stream for stream in self.streams
+                if (streams_set is None or stream.name in streams_set)
+                    and stream.name not in self._delays_calculated
+        ]
+
+        if max_workers > 1 and len(wanted) > 1:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                results = executor.map(self._calculate_delays_worker, [stream.name for stream in wanted])
+                for stream, (best_cases, worst_cases, multiplications) in zip(wanted, results):
+                    statistics = self.stream_statistics[stream.name]
+                    statistics.best_cases[:] = best_cases
+                    statistics.worst_cases[:] = worst_cases
+                    statistics._sum_cache.clear()
+                    stream.saved_multiplications = multiplications
+                    self._delays_calculated.add(stream.name)
+            # Fresh delays can change the bandwidth recalculation inputs
+            self._bandwidth_stable = False
+            return
+
+        for stream in wanted:
             self.calculate_delays_for_stream(stream)
 
     def get_resource_utilization_for_stream(self, stream: Stream):
         debug(f'Calculating resource utilization for stream {stream.name}')
 
         path = self.stream_paths[stream.name]
+        path_meta = self.path_meta[(stream.sender, stream.receiver)]
         stream_statistics = self.stream_statistics[stream.name]
         stream_statistics.clear_resource_utilization()
 
-        all_nodes = self.topology.G.nodes(data=True)
-        all_edges = self.topology.G.edges(data=True)
-                
         factor = 1
         occupancies = []
-        for index, node_name in enumerate(path):
-            node_data = all_nodes[node_name]
-
-            if not is_tx_port(node_name, None, path):
-                continue
+        for index in self.tx_port_indices[(stream.sender, stream.receiver)]:
+            node_name = path[index]
+            node_data = path_meta[index].node_data
 
             debug(f"Calculating node {node_name}")
             port_statistics = stream_statistics.get_port_statistics(node_name)
-            edge = self.topology.G.get_edge_data(node_name, path[index+1])
+            edge = path_meta[index].edge_data
 
             interfering_streams = self.get_interfering_streams(stream, node_name)
             debug(f'Interfering streams: {", ".join([stream.name for stream in interfering_streams])}')
 
-            interfering_streams_delays = [self.get_stream_transmission_duration(stream, edge["link_speed"], node_name) + edge["transmission_jitter"] for stream in interfering_streams]
+            interfering_framesizes = np.fromiter(
+                (self.get_bandwidth(s, node_name) + 20 for s in interfering_streams),
+                dtype=np.int64, count=len(interfering_streams)
+            )
+            interfering_streams_delays = get_transmission_durations(interfering_framesizes, edge["link_speed_bytes"]) + edge["transmission_jitter"]
             debug(f'Interfering stream delays1: {interfering_streams_delays}')
-            try:
-                factor *= max(1,stream.saved_multiplications[index])
-            except:
-                factor *= 1
+            if index < len(stream.saved_multiplications):
+                saved_multiplication = stream.saved_multiplications[index]
+                if saved_multiplication > 1:
+                    factor *= saved_multiplication
 
             if node_data["gcl"]:
                 window_size = int(node_data["gcl_open"])
             else:
                 window_size = stream.cycletime
             # TODO: why do we add framesize to the delays (also, do we need to add layer 1 overhead)?
-            debug("own delay:", (self.get_stream_transmission_duration(stream, edge["link_speed"], node_name)*factor), edge["link_speed"])
-            occupancy = sum(interfering_streams_delays) + (self.get_stream_transmission_duration(stream, edge["link_speed"], node_name)*factor)
+            debug("own delay:", (self.get_stream_transmission_duration(stream, edge["link_speed_bytes"], node_name)*factor), edge["link_speed"])
+            occupancy = interfering_streams_delays.sum() + (self.get_stream_transmission_duration(stream, edge["link_speed_bytes"], node_name)*factor)
             debug(f'occupancy: {occupancy}')
             debug(f'window_size: {window_size}')
-            occupancies.append(occupancy / window_size)
-            port_statistics.resource_utilization = occupancy / window_size
+            resource_utilization = float(occupancy / window_size)
+            occupancies.append(resource_utilization)
+            port_statistics.resource_utilization = resource_utilization
         return occupancies
 
     def get_resource_utilization(self, streams: List[str] = None):
         """
         @param streams Name of the streams for which the resource utilization should be calculated
+        @returns The maximum occupancy over all requested streams
         """
-        for stream in self.streams:
-            self.calculate_delays_for_stream(stream)
+        max_occupancy = None
+        streams_set = None if streams is None else frozenset(streams)
 
         for stream in self.streams:
-            if streams is not None and len([s for s in streams if s == stream.name]) == 0:
+            if streams_set is not None and stream.name not in streams_set:
                 continue
-            occupancies = self.get_resource_utilization_for_stream(stream)
-            return max(occupancies)
 
-    def export_json(self, path: str):
-        json_dict = {}
+            # The utilization is based on the delays, only calculate them if the caller did not already
+            if stream.name not in self._delays_calculated:
+                self.calculate_delays_for_stream(stream)
 
-        json_dict['topologyName'] = self.topology.name
-        json_dict['streams'] = []
-
-        for stream in self.streams:
-            stream_statistics = self.stream_statistics[stream.name]
-            stream_dict = {}
+            occupancies = self.get_resource_utilization_for_stream(stream)
+            if len(occupancies) != 0:
+                max_occupancy = max(occupancies) if max_occupancy is None else max(max_occupancy, max(occupancies))
 
-            stream_dict['name'] = stream.name
-            stream_dict['summarizedBestCaseDelay'] = stream_statistics.get_summarized_best_case()
-            stream_dict['summarizedWorstCaseDelay'] = stream_statistics.get_summarized_worst_case()
-            stream_dict['delaysPerPort'] = []
+        return max_occupancy
 
-            for port_statistics in stream_statistics.delays_per_port:
-                port_dict = {}
-                port_dict['node'] = port_statistics.node_name
-                port_dict['port'] = port_statistics.port_name
-                port_dict['direction'] = port_statistics.direction
-                port_dict['bestCaseDelay'] = port_statistics.best_case
-                port_dict['worstCaseDelay'] = port_statistics.worst_case
+    def export_json(self, path: str):
+        def port_to_dict(port_statistics: PortStatistics) -> dict:
+            port_dict = {
+                'node': port_statistics.node_name,
+                'port': port_statistics.port_name,
+                'direction': port_statistics.direction,
+                'bestCaseDelay': port_statistics.best_case,
+                'worstCaseDelay': port_statistics.worst_case
+            }
 
-                if port_statistics.direction == 'tx':
-                    port_dict['resourceUtilization'] = round(port_statistics.resource_utilization, 4)
+            if port_statistics.direction == 'tx':
+                port_dict['resourceUtilization'] = round(port_statistics.resource_utilization, 4)
 
-                stream_dict["delaysPerPort"].append(port_dict)
+            return port_dict
 
-            json_dict["streams"].append(stream_dict)
+        def stream_to_dict(stream: Stream) -> dict:
+            stream_statistics = self.stream_statistics[stream.name]
+            return {
+                'name': stream.name,
+                'summarizedBestCaseDelay': stream_statistics.get_summarized_best_case(),
+                'summarizedWorstCaseDelay': stream_statistics.get_summarized_worst_case(),
+                'delaysPerPort': [port_to_dict(port_statistics) for port_statistics in stream_statistics.delays_per_port]
+            }
+
+        json_dict = {
+            'topologyName': self.topology.name,
+            'streams': [stream_to_dict(stream) for stream in self.streams]
+        }
 
         try:
             with open(path, 'w') as f:
@@ -1,6 +1,11 @@
 import argparse
 import json
+import os
 import pickle
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+import numpy as np
 from latency_jitter_model.calculator import Calculator
 from latency_jitter_model.topology import Topology
 from latency_jitter_model.helpers import print_results
@@ -8,6 +13,28 @@ from latency_jitter_model.helpers import print_results
 
 ALLOWED_SCENARIOS = ["arrival_window", "congestion", "inefficient_trans"]
 
+_ROW_TEMPLATE = "| %7s | %13s | %13s | %13s | %13s | %21s |"
+"""Result table row of the conext evaluation; %-formatting substitutes and
+right-justifies in one pass without re-parsing a format string per row"""
+
+
+def _advise_sequential(f):
+    """Tells the OS that the given file is read front to back once,
+    so it can read ahead aggressively (no-op where posix_fadvise is unavailable)
+    """
+    if hasattr(os, 'posix_fadvise'):
+        os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+
+def _run_model(topology_instance):
+    """Runs the delay and resource utilization calculation for the given topology
+    and returns the calculator (shared by all entry points below)
+    """
+    calculator = Calculator(topology=topology_instance, streams=topology_instance.streams)
+    calculator.calculate_delays()
+    calculator.get_resource_utilization()
+    return calculator
+
 
 def execute_latency_jitter_model_examples(scenario, topology_path, output_path=None):
     """
@@ -20,24 +47,22 @@ def execute_latency_jitter_model_examples(scenario, topology_path, output_path=N
         exit(1)
 
     try:
-        with open(topology_path) as f:
-            topology_dict = json.load(f)
-    except IOError: 
+        # One binary read of the whole file; json.loads decodes the bytes
+        # directly instead of going through an incremental text wrapper
+        with open(topology_path, 'rb') as f:
+            _advise_sequential(f)
+            topology_dict = json.loads(f.read())
+    except OSError:
         print('Error opening topology file')
         exit(1)
     except json.JSONDecodeError as e:
         print('Error parsing JSON from topology file')
         print(e.msg)
         exit(1)
-    except:
-        print('Error opening and parsing topology file')
-        raise
 
     topology_instance = Topology.from_json(topology_dict)
 
-    calculator = Calculator(topology=topology_instance, streams=topology_instance.streams)
-    calculator.calculate_delays()
-    calculator.get_resource_utilization()
+    calculator = _run_model(topology_instance)
 
     if output_path is not None:
         res = calculator.export_json(output_path)
@@ -47,65 +72,124 @@ def execute_latency_jitter_model_examples(scenario, topology_path, output_path=N
     print_results(scenario, topology_instance, calculator)
 
 
+@lru_cache(maxsize=128)
+def _build_topology(setting, toponame):
+    """Builds the topology for the given dataset setting and topology file once
+    and returns it pickled, so rows sharing the same topology skip the repeated
+    parse and graph construction. The pickle roundtrip in the caller yields a
+    fresh copy per row without a handwritten deepcopy of the internal graph.
+    """
+    topology_instance = Topology(setting)
+    topology_instance.from_toponame(toponame)
+    return pickle.dumps(topology_instance)
+
+
+def _eval_row(ds):
+    """Runs the model for one dataset row and returns the predicted best case,
+    worst case and maximum resource utilization.
+    The rows are independent of each other, so they can be evaluated in parallel.
+    """
+    topology_instance = pickle.loads(_build_topology(ds["setting"], ds["file"]))
+
+    calculator = _run_model(topology_instance)
+
+    # The per-port delays live in parallel arrays on StreamStatistics, so the
+    # last hop and the tx port utilizations are read directly instead of
+    # loading them attribute by attribute from the PortStatistics objects
+    stream_statistics = calculator.stream_statistics['Stream 1']
+
+    c_bc = stream_statistics.best_cases[-1] if stream_statistics.best_cases.size else 0
+    c_wc = stream_statistics.worst_cases[-1] if stream_statistics.worst_cases.size else 0
+
+    # Only tx ports are valid; the rounding and the maximum run inside numpy
+    # instead of a data-dependent compare-and-assign per port
+    tx_utilizations = stream_statistics.resource_utilizations[stream_statistics.tx_port_mask]
+    c_utilization = int(np.round(tx_utilizations * 100).max()) if tx_utilizations.size else 0
+
+    return c_bc, c_wc, c_utilization
+
+
+def iter_dataset(dataset_path):
+    """Yields the dataset rows one by one.
+    Supports both a single pickled list of rows and a stream of individually
+    pickled rows (as written by convert_dataset_to_stream), so only one row of
+    a large dataset has to be reconstructed in memory at a time.
+    """
+    with open(dataset_path, 'rb') as f:
+        _advise_sequential(f)
+        unpickler = pickle.Unpickler(f)
+        while True:
+            try:
+                item = unpickler.load()
+            except EOFError:
+                return
+            if isinstance(item, list):
+                yield from item
+            else:
+                yield item
+
+
+def convert_dataset_to_stream(dataset_path, output_path):
+    """One-time converter that re-pickles each row of a monolithic dataset
+    separately, so iter_dataset can stream the result row by row
+    """
+    with open(output_path, 'wb') as f:
+        for ds in iter_dataset(dataset_path):
+            pickle.dump(ds, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
 def execute_latency_jitter_model_conext_eval(dataset_path):
     """
     @dataset_path: Path to the dataset pkl file
     """
+    # The rows are independent, so they are streamed into a pool of workers
+    # and only the small result tuples are kept in memory
     try:
-        with open(dataset_path, 'rb') as f:
-            dataset = pickle.load(f)
-    except IOError: 
+        with ProcessPoolExecutor() as executor:
+            rows = list(executor.map(_eval_row, iter_dataset(dataset_path), chunksize=8))
+    except OSError:
         print('Error opening dataset file')
         exit(1)
-    except json.JSONDecodeError as e:
-        print('Error parsing JSON from dataset file')
-        print(e.msg)
+    except pickle.UnpicklingError as e:
+        print('Error parsing dataset file')
+        print(e)
         exit(1)
-    except:
-        print('Error opening and parsing dataset file')
-        raise
-
-    errors = []
-
-    print("---------------------------------------------------------------------------------------------------")
-    print("| {!s} | {!s} | {!s} | {!s} | {!s} | {!s} |".format(str("Setting").rjust(7), str("Pred. BC [µs]").rjust(13), \
-                                                               str("Meas. BC [µs]").rjust(13), str("Meas. WC [µs]").rjust(13), \
-                                                               str("Pred. WC [µs]").rjust(13), str("Pred. Utilization [%]").rjust(21)))
-    print("---------------------------------------------------------------------------------------------------")
-
-    for ds in dataset:
-        topology_instance = Topology(ds["setting"])
-        topology_instance.from_toponame(ds["file"])
-
-        calculator = Calculator(topology=topology_instance, streams=topology_instance.streams)
-
-        calculator.calculate_delays()
-        calculator.get_resource_utilization()
-        stream_statistics = calculator.stream_statistics
-        
-        c_bc = 0
-        c_wc = 0
-        c_utilization = 0
-        for port_statistics in stream_statistics['Stream 1'].delays_per_port:
-            c_bc = port_statistics.best_case
-            c_wc = port_statistics.worst_case
-            if port_statistics.direction != 'tx' or port_statistics.port_name == None:
-                # Only tx ports are valid
-                continue
-            c_utilization = c_utilization if c_utilization >= round(port_statistics.resource_utilization * 100) \
-                                            else round(port_statistics.resource_utilization * 100)
-        
-        if (c_bc/1000 > ds["mmin"] or c_wc/1000 < ds["mmax"]) and (c_utilization < 100):
-            errors.append([ds, c_bc/1000, c_wc/1000, c_utilization])
-
-        print("| {!s} | {!s} | {!s} | {!s} | {!s} | {!s} |".format(str(ds["setting"]).rjust(7), \
-                                                                   str(round(c_bc/1000, 2)).rjust(13), \
-                                                                   str(round(ds["mmin"], 2)).rjust(13), \
-                                                                   str(round(ds["mmax"], 2)).rjust(13), \
-                                                                   str(round(c_wc/1000, 2)).rjust(13), \
-                                                                   str(round(c_utilization, 2)).rjust(21)))
-
-    print("---------------------------------------------------------------------------------------------------")
+
+    # The table is built in memory and written with a single call,
+    # instead of paying for one flushing print per row; the dataset is
+    # streamed a second time for the measurement columns
+    separator = "---------------------------------------------------------------------------------------------------"
+
+    lines = [separator]
+    lines.append(_ROW_TEMPLATE % ("Setting", "Pred. BC [µs]", "Meas. BC [µs]", \
+                                  "Meas. WC [µs]", "Pred. WC [µs]", "Pred. Utilization [%]"))
+    lines.append(separator)
+
+    mmin_list = []
+    mmax_list = []
+    for ds, (c_bc, c_wc, c_utilization) in zip(iter_dataset(dataset_path), rows):
+        mmin_list.append(ds["mmin"])
+        mmax_list.append(ds["mmax"])
+        lines.append(_ROW_TEMPLATE % (ds["setting"], round(c_bc/1000, 2), round(ds["mmin"], 2), \
+                                      round(ds["mmax"], 2), round(c_wc/1000, 2), round(c_utilization, 2)))
+
+    lines.append(separator)
+
+    bc = np.array([c_bc/1000 for c_bc, _, _ in rows])
+    wc = np.array([c_wc/1000 for _, c_wc, _ in rows])
+    utilization = np.array([c_utilization for _, _, c_utilization in rows])
+    mmin = np.array(mmin_list)
+    mmax = np.array(mmax_list)
+
+    err_mask = ((bc > mmin) | (wc < mmax)) & (utilization < 100)
+    err_indices = set(np.flatnonzero(err_mask).tolist())
+
+    # Only the offending rows are materialized for the error report
+    errors = [
+        [ds, rows[index][0]/1000, rows[index][1]/1000, rows[index][2]]
+        for index, ds in enumerate(iter_dataset(dataset_path)) if index in err_indices
+    ] if err_indices else []
+    sys.stdout.write("\n".join(lines) + "\n")
     print()
     if len(errors) != 0:
         print(f"Not all predictions allign with the measurements. Following '{len(errors)}' Errors found:")
@@ -1,6 +1,9 @@
+from functools import lru_cache
 from typing import Dict, Literal, List
 
-from latency_jitter_model.path_helpers import is_rx_port
+import numpy as np
+
+from latency_jitter_model.path_helpers import build_port_masks
 
 DEBUG = False
 
@@ -14,6 +17,16 @@ ExpressPriorities = List[Priority]
 GclPriorities = List[Priority]
 """List of priorities that can preempt other frames with priorities that are not part of the express group"""
 
+def priority_list_to_mask(priorities: List[Priority]) -> int:
+    """Packs the given priority list into an 8-bit mask with bit n set iff priority n is present.
+    Membership and equality checks on the mask are single integer operations
+    instead of list scans.
+    """
+    mask = 0
+    for priority in priorities:
+        mask |= 1 << priority
+    return mask
+
 StreamDelay = Dict[str, int]
 """Delay caused by each node on the path of a stream.
 
@@ -22,15 +35,55 @@ Rx and tx of a node are separated using the suffix "-rx" and "-tx".
 Rx includes the processing delay, tx all other delays caused by queueing and transmission of a frame.
 """
 
+@lru_cache(maxsize=None)
+def _split_node_name(node_name: str) -> tuple:
+    """Splits a path node name into its (node name, port name) parts.
+    The same port node names come up for every stream crossing them, so the split is memoized.
+    """
+    split = node_name.split('-')
+    return split[0], split[1] if len(split) > 1 else None
+
 class PortStatistics:
-    def __init__(self, node_name: str, port_name: str, direction: Literal['rx', 'tx'], best_case: int = 0, worst_case: int = 0, resource_utilization: float = 0) -> None:
+    """Statistics of one port on a stream path.
+
+    best_case, worst_case and resource_utilization are views into the preallocated
+    arrays of the owning StreamStatistics, so clearing a stream is a plain array fill.
+    """
+    __slots__ = ('node_name', 'port_name', 'direction', '_statistics', '_index')
+
+    def __init__(self, node_name: str, port_name: str, direction: Literal['rx', 'tx'], statistics: 'StreamStatistics', index: int) -> None:
         self.node_name: str = node_name
         self.port_name: str = port_name
         self.direction: Literal['rx', 'tx'] = direction
-        self.best_case: int = best_case
-        self.worst_case: int = worst_case
-        self.resource_utilization: float = resource_utilization
+        self._statistics = statistics
+        self._index = index
+
+    @property
+    def best_case(self):
+        return self._statistics.best_cases[self._index]
+
+    @best_case.setter
+    def best_case(self, value):
+        self._statistics.best_cases[self._index] = value
+        self._statistics._sum_cache.clear()
+
+    @property
+    def worst_case(self):
+        return self._statistics.worst_cases[self._index]
+
+    @worst_case.setter
+    def worst_case(self, value):
+        self._statistics.worst_cases[self._index] = value
+        self._statistics._sum_cache.clear()
+
+    @property
+    def resource_utilization(self):
         """Resource utilization is only valid for tx ports"""
+        return self._statistics.resource_utilizations[self._index]
+
+    @resource_utilization.setter
+    def resource_utilization(self, value):
+        self._statistics.resource_utilizations[self._index] = value
 
     def clear(self):
         self.best_case = 0
@@ -40,14 +93,16 @@ class PortStatistics:
 class StreamStatistics:
     def __init__(self, stream_name: str, path: List[str], all_node_data) -> None:
         self.stream_name: str = stream_name
-        self.delays_per_port: List[PortStatistics] = []
 
+        ports = []
+        port_node_names = []
+        rx_mask, _ = build_port_masks(path)
         for index, node_name in enumerate(path):
             if index == 0:
                 continue
             if index == len(path)-1:
                 break
-            if is_rx_port(node_name, None, path):
+            if rx_mask[index]:
                 continue
 
             node_data = all_node_data[node_name]
@@ -57,28 +112,70 @@ class StreamStatistics:
             else:
                 direction = 'tx'
 
-            split = node_name.split('-')
-            self.delays_per_port.append(PortStatistics(
-                node_name=split[0],
-                port_name=split[1] if len(split) > 1 else None,
-                direction=direction
-            ))
+            name, port = _split_node_name(node_name)
+            ports.append((name, port, direction))
+            port_node_names.append(node_name)
+
+        self.best_cases: "np.ndarray" = np.zeros(len(ports))
+        """Best case delay per entry of delays_per_port in nanoseconds"""
+        self.worst_cases: "np.ndarray" = np.zeros(len(ports))
+        """Worst case delay per entry of delays_per_port in nanoseconds"""
+        self.resource_utilizations: "np.ndarray" = np.zeros(len(ports))
+        """Resource utilization per entry of delays_per_port (only valid for tx ports)"""
+
+        self.tx_port_mask: "np.ndarray" = np.fromiter(
+            (direction == 'tx' and port_name is not None for _, port_name, direction in ports),
+            dtype=bool, count=len(ports)
+        )
+        """True for the entries of delays_per_port that are tx ports,
+        so readers can select the valid resource utilizations without walking the objects"""
+
+        self._sum_cache: Dict[tuple, float] = {}
+        """Already summarized delays with the ('best'/'worst', stop label) tuple as key.
+        Cleared whenever a delay is written, so entries are never stale.
+        Callers that write the delay arrays directly must clear it themselves.
+        """
+
+        self.delays_per_port: List[PortStatistics] = [
+            PortStatistics(node_name=node_name, port_name=port_name, direction=direction, statistics=self, index=index)
+            for index, (node_name, port_name, direction) in enumerate(ports)
+        ]
 
-    def clear(self):
+        self.port_statistics_map: Dict[str, PortStatistics] = dict(zip(port_node_names, self.delays_per_port))
+        """The entries of delays_per_port with the full path node name as key.
+        Nodes without statistics (talker, listener, rx ports) are simply absent.
+        """
+
+        self._by_key: Dict[tuple, PortStatistics] = {}
+        """The entries of delays_per_port with the (node name, port name) tuple as key.
+        (node name, None) maps to the first entry of the node, matching the old scan order.
+        """
         for statistics in self.delays_per_port:
-            statistics.clear()
+            self._by_key.setdefault((statistics.node_name, statistics.port_name), statistics)
+            self._by_key.setdefault((statistics.node_name, None), statistics)
+
+        self._stop_index: Dict[str, int] = {
+            f'{node_name}-{port_name}-{direction}': index
+            for index, (node_name, port_name, direction) in enumerate(ports)
+        }
+        """Index into the delay arrays by the stop label used by get_summarized_best_case/get_summarized_worst_case"""
+
+    def clear(self):
+        self.best_cases.fill(0)
+        self.worst_cases.fill(0)
+        self.resource_utilizations.fill(0)
+        self._sum_cache.clear()
 
     def clear_best_case(self):
-        for statistics in self.delays_per_port:
-            statistics.best_case = 0
+        self.best_cases.fill(0)
+        self._sum_cache.clear()
 
     def clear_worst_case(self):
-        for statistics in self.delays_per_port:
-            statistics.worst_case = 0
+        self.worst_cases.fill(0)
+        self._sum_cache.clear()
 
     def clear_resource_utilization(self):
-        for statistics in self.delays_per_port:
-            statistics.resource_utilization = 0
+        self.resource_utilizations.fill(0)
 
     def get_port_statistics(self, node_name: str, port_name: str = None) -> PortStatistics:
         """Returns statistics for the given port.
@@ -86,41 +183,37 @@ class StreamStatistics:
         If `node_name` and `port_name` are concatenated using "-" in one string, set `port_name` to None and only use `node_name`
         """
         if port_name is None:
-            split = node_name.split('-')
-            node_name = split[0]
-            port_name = split[1] if len(split) > 1 else None
+            node_name, port_name = _split_node_name(node_name)
 
-        return [d for d in self.delays_per_port if d.node_name == node_name and (port_name is None or d.port_name == port_name)][0]
+        return self._by_key[(node_name, port_name)]
 
     def get_summarized_best_case(self, stop_at_node: str = None) -> int:
         """Calculates and returns the best case sum of the delays caused by each node in nanoseconds
         @param stop_at_node Only calculates the sum until (including) the given node name (must include the -tx/-rx)
         """
-        if stop_at_node is None:
-            delays = [statistics.best_case for statistics in self.delays_per_port]
-        else:
-            delays = []
-            for statistics in self.delays_per_port:
-                delays.append(statistics.best_case)
-                if stop_at_node == f'{statistics.node_name}-{statistics.port_name}-{statistics.direction}':
-                    break
+        key = ('best', stop_at_node)
+        if key not in self._sum_cache:
+            if stop_at_node is None:
+                self._sum_cache[key] = sum(self.best_cases)
+            else:
+                stop = self._stop_index.get(stop_at_node, len(self.best_cases)-1)
+                self._sum_cache[key] = sum(self.best_cases[:stop+1])
 
-        return sum(delays)
+        return self._sum_cache[key]
 
     def get_summarized_worst_case(self, stop_at_node: str = None) -> int:
         """Calculates and returns the worst case sum of the delays caused by each node in nanoseconds
         @param stop_at_node Only calculates the sum until (including) the given node name (must include the -tx/-rx)
         """
-        if stop_at_node is None:
-            delays = [statistics.worst_case for statistics in self.delays_per_port]
-        else:
-            delays = []
-            for statistics in self.delays_per_port:
-                delays.append(statistics.worst_case)
-                if stop_at_node == f'{statistics.node_name}-{statistics.port_name}-{statistics.direction}':
-                    break
+        key = ('worst', stop_at_node)
+        if key not in self._sum_cache:
+            if stop_at_node is None:
+                self._sum_cache[key] = sum(self.worst_cases)
+            else:
+                stop = self._stop_index.get(stop_at_node, len(self.worst_cases)-1)
+                self._sum_cache[key] = sum(self.worst_cases[:stop+1])
 
-        return sum(delays)
+        return self._sum_cache[key]
 
     # def add_best_case(self, node_name: str, port_name: str, delay: int):
     #     """Adds the best case for the given node and port.
@@ -153,15 +246,29 @@ def debug(*text):
     if DEBUG:
         print(*text)
 
-def get_transmission_duration(framesize: int, link_speed: int) -> int:
+@lru_cache(maxsize=None)
+def get_transmission_duration(framesize: int, link_speed_bytes: float) -> int:
     """Calculates transmission duration of the stream using given frame size and given link speed
 
+    The result only depends on the two arguments, so it is memoized.
+    The same (framesize, link speed) pairs come up for every interfering stream on every port.
+
     @framesize Frame size in bytes (must include L1 overhead)
-    @link_speed Link speed in Mbit/s
+    @link_speed_bytes Link speed in bytes per second (precomputed per edge from the Mbit/s link speed)
 
     @returns Transmission duration in bytes
     """
-    return ((framesize) / (link_speed / 8 * 1000000)) * 1000000000
+    return ((framesize) / link_speed_bytes) * 1000000000
+
+def get_transmission_durations(framesizes: "np.ndarray", link_speed_bytes: float) -> "np.ndarray":
+    """Vectorized variant of `get_transmission_duration` for an array of frame sizes
+
+    @framesizes Frame sizes in bytes (must include L1 overhead)
+    @link_speed_bytes Link speed in bytes per second (precomputed per edge from the Mbit/s link speed)
+
+    @returns Transmission durations in nanoseconds
+    """
+    return (framesizes / link_speed_bytes) * 1000000000
 
 def get_summarized_delay(stream_delay: StreamDelay, stop_at_node: str = None) -> int:
     """Calculates and returns the sum of the delays caused by each node in nanoseconds
@@ -1,84 +1,163 @@
-from typing import List
+from typing import Dict, List, Tuple
 
-def get_ancestor_forwarding_node_name(path: List[str], node_index: int = None, node_name: str = None) -> str:
+import numpy as np
+
+def build_path_index(path: List[str]) -> Dict[str, int]:
+    """Returns a node name to path index map for the given path.
+    Build it once per path and pass it to the helpers below to replace their
+    linear path.index() scans with a single dictionary lookup.
+    """
+    return {node_name: index for index, node_name in enumerate(path)}
+
+def parse_path(path: List[str]) -> List[Tuple[str, bool]]:
+    """Returns a (forwarding node name, is port) tuple for each node of the given path.
+    Build it once per path and pass it to the helpers below to avoid
+    re-splitting the node names on every call.
+    """
+    parsed = []
+    for node_name in path:
+        forwarding_node_name, separator, _ = node_name.partition('-')
+        parsed.append((forwarding_node_name, separator != ''))
+    return parsed
+
+def build_port_masks(path: List[str]) -> Tuple["np.ndarray", "np.ndarray"]:
+    """Returns (rx_mask, tx_mask) boolean arrays for the given path.
+    rx_mask[i] / tx_mask[i] is the is_rx_port / is_tx_port answer for path[i],
+    computed for the whole path at once with shifted array comparisons
+    instead of one helper call per node.
+    """
+    port_flags = np.fromiter(('-' in node_name for node_name in path), dtype=bool, count=len(path))
+    adjacent_ports = port_flags[:-1] & port_flags[1:]
+
+    rx_mask = np.zeros(len(path), dtype=bool)
+    tx_mask = np.zeros(len(path), dtype=bool)
+    rx_mask[1:] = adjacent_ports
+    tx_mask[:-1] = adjacent_ports
+    return rx_mask, tx_mask
+
+def get_ancestor_forwarding_node_name(path: List[str], node_index: int = None, node_name: str = None, path_idx: Dict[str, int] = None, parsed_path: List[Tuple[str, bool]] = None) -> str:
     """Returns the name of the forwarding node that comes before the given forwarding node (or one of its ports) in the forwarding path
     The given node is identified using the given node index or the given node name
     (only one of them is required).
+    @param path_idx Optional map built with build_path_index to avoid scanning the path
+    @param parsed_path Optional list built with parse_path to avoid re-splitting the node name (requires node_index)
     Returns None if there is no ancestor.
     """
-    if node_name is None:
-        node_name = path[node_index]
+    forwarding_node_index = None
 
-    # Get the forwarding node that belongs to the given port (if node isn't already a forwarding node)
-    if '-' in node_name:
-        forwarding_node_name = node_name.split('-')[0]
+    if parsed_path is not None and node_index is not None:
+        forwarding_node_name, is_port = parsed_path[node_index]
+        if not is_port:
+            # The node itself is the forwarding node, so its index is already known
+            forwarding_node_index = node_index
     else:
-        forwarding_node_name = node_name
+        if node_name is None:
+            node_name = path[node_index]
 
-    forwarding_node_index = path.index(forwarding_node_name)
+        # Get the forwarding node that belongs to the given port in a single scan
+        # (the head is the whole node name when there is no hyphen)
+        forwarding_node_name, separator, _ = node_name.partition('-')
+        if separator == '' and node_index is not None:
+            forwarding_node_index = node_index
+
+    if forwarding_node_index is None:
+        if path_idx is not None:
+            forwarding_node_index = path_idx[forwarding_node_name]
+        else:
+            forwarding_node_index = path.index(forwarding_node_name)
 
     if forwarding_node_index < 3:
         return None
-    
+
     return path[forwarding_node_index - 3]
 
-def get_ancestor_tx_port_node_name(path: List[str], node_index: int = None, node_name: str = None) -> str:
+def get_ancestor_tx_port_node_name(path: List[str], node_index: int = None, node_name: str = None, path_idx: Dict[str, int] = None, parsed_path: List[Tuple[str, bool]] = None) -> str:
     """Returns the name of the tx port node that comes before the given forwarding node or port in the forwarding path
     The given node is identified using the given node index or the given node name
     (only one of them is required).
+    @param path_idx Optional map built with build_path_index to avoid scanning the path
+    @param parsed_path Optional list built with parse_path to avoid re-splitting the node name (requires node_index)
     Returns None if there is no ancestor.
     """
-    if node_name is None:
-        node_name = path[node_index]
+    forwarding_node_index = None
 
-    # Get the forwarding node that belongs to the given port (if node isn't already a forwarding node)
-    if '-' in node_name:
-        forwarding_node_name = node_name.split('-')[0]
+    if parsed_path is not None and node_index is not None:
+        forwarding_node_name, is_port = parsed_path[node_index]
+        if not is_port:
+            # The node itself is the forwarding node, so its index is already known
+            forwarding_node_index = node_index
     else:
-        forwarding_node_name = node_name
+        if node_name is None:
+            node_name = path[node_index]
 
-    forwarding_node_index = path.index(forwarding_node_name)
+        # Get the forwarding node that belongs to the given port in a single scan
+        # (the head is the whole node name when there is no hyphen)
+        forwarding_node_name, separator, _ = node_name.partition('-')
+        if separator == '' and node_index is not None:
+            forwarding_node_index = node_index
+
+    if forwarding_node_index is None:
+        if path_idx is not None:
+            forwarding_node_index = path_idx[forwarding_node_name]
+        else:
+            forwarding_node_index = path.index(forwarding_node_name)
 
     if forwarding_node_index < 2:
         return None
-    
+
     return path[forwarding_node_index - 2]
 
 def is_forwarding_node(node_name: str) -> bool:
     """Returns True if the given graph node name represents a forwarding node"""
     return '-' not in node_name
 
-def is_port(node_name) -> bool:
+def is_port(node_name: str) -> bool:
     """Returns True if the given graph node name represents a port node"""
     return '-' in node_name
 
-def is_rx_port(node_name: str, port_name: str, path: List[str]) -> bool:
+def is_rx_port(node_name: str, port_name: str, path: List[str], path_idx: Dict[str, int] = None, parsed_path: List[Tuple[str, bool]] = None) -> bool:
     """Returns whether the given port is a receiving port on the given path, i.e., receives packets of the stream with the given path.
-    
+
     If `node_name` and `port_name` are concatenated using "-" in one string, set `port_name` to None and only use `node_name`.
+    @param path_idx Optional map built with build_path_index to avoid scanning the path
+    @param parsed_path Optional list built with parse_path to avoid re-scanning the node names
     """
     if port_name is not None:
-        port_index = path.index(f'{node_name}-{port_name}')
+        node_name = f'{node_name}-{port_name}'
+
+    if path_idx is not None:
+        port_index = path_idx[node_name]
     else:
         port_index = path.index(node_name)
 
     if port_index == 0:
         return False
 
+    if parsed_path is not None:
+        return parsed_path[port_index - 1][1] and parsed_path[port_index][1]
+
     return '-' in path[port_index - 1] and '-' in path[port_index]
 
-def is_tx_port(node_name: str, port_name: str, path: List[str]) -> bool:
+def is_tx_port(node_name: str, port_name: str, path: List[str], path_idx: Dict[str, int] = None, parsed_path: List[Tuple[str, bool]] = None) -> bool:
     """Returns whether the given port is a sending port on the given path, i.e., sends packets of the stream with the given path.
-    
+
     If `node_name` and `port_name` are concatenated using "-" in one string, set `port_name` to None and only use `node_name`.
+    @param path_idx Optional map built with build_path_index to avoid scanning the path
+    @param parsed_path Optional list built with parse_path to avoid re-scanning the node names
     """
 
     if port_name is not None:
-        port_index = path.index(f'{node_name}-{port_name}')
+        node_name = f'{node_name}-{port_name}'
+
+    if path_idx is not None:
+        port_index = path_idx[node_name]
     else:
         port_index = path.index(node_name)
 
     if port_index == len(path) - 1:
         return False
 
+    if parsed_path is not None:
+        return parsed_path[port_index][1] and parsed_path[port_index + 1][1]
+
     return '-' in path[port_index] and '-' in path[port_index + 1]
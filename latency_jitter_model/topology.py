@@ -1,9 +1,11 @@
+import re
+from collections import defaultdict
 from typing import Any, List, TypedDict, Union
 import networkx as nx
+import numpy as np
 import matplotlib.pyplot as plt
 
-from latency_jitter_model.helpers import GclPriorities, ExpressPriorities, Priority, TopologyParsingError, debug, get_transmission_duration
-from latency_jitter_model.path_helpers import is_forwarding_node, is_port
+from latency_jitter_model.helpers import GclPriorities, ExpressPriorities, Priority, TopologyParsingError, debug, get_transmission_duration, priority_list_to_mask
 from latency_jitter_model.stream import Stream, StreamJson
 
 TsnDomain = Union[str, None]
@@ -27,9 +29,57 @@ DEFAULT_FRAME_PREEMPTION_ENABLED = False
 DEFAULT_EXPRESS_PRIORITIES = []
 DEFAULT_GCL_PRIORITIES = [0, 1, 2, 3, 4, 5, 6, 7]
 
+_GCL_PORT_DEFAULTS = (DEFAULT_GCL_CYCLE, DEFAULT_GCL_OPEN, DEFAULT_GCL_OFFSET, DEFAULT_GCL_PRIORITIES)
+
+# TODO: link speed is hardcoded for recalculate_gcl and should be fetched from the corresponding edge instead
+_GCL_LINK_SPEED_BYTES = 1000 / 8 * 1000000
+"""Hardcoded 1000 Mbit/s link speed as a byte rate, as expected by get_transmission_duration"""
+
+_CT = 100000
+"""Cycle time in ns (100µs) of the from_toponame scenario topologies"""
+
+_SW1_PARAMS = {
+    'c201': dict(gcl=True, gcl_offset=10000, gcl_open=55000, gcl_cycle=_CT, gcl_priorities=[7]),
+    'c211': dict(gcl=True, gcl_offset=30000, gcl_open=55000, gcl_cycle=_CT, gcl_priorities=[7]),
+    'c221': dict(gcl=True, gcl_offset=15000, gcl_open=20000, gcl_cycle=_CT/2, gcl_priorities=[7]),
+}
+"""Parameters of port 1 of switch 1 per scenario token"""
+
+_SW2_PARAMS = {
+    'c202': dict(gcl=True, gcl_offset=5000,  gcl_open=25000, gcl_cycle=_CT, gcl_priorities=[7]),
+    'c212': dict(gcl=True, gcl_offset=25000, gcl_open=55000, gcl_cycle=_CT, gcl_priorities=[7]),
+    'c222': dict(gcl=True, gcl_offset=25000, gcl_open=80000, gcl_cycle=_CT*2, gcl_priorities=[7]),
+    'c232': dict(gcl=True, gcl_offset=25000, gcl_open=80000, gcl_cycle=_CT*3, gcl_priorities=[7]),
+    'c242': dict(gcl=True, gcl_offset=5000, gcl_open=80000, gcl_cycle=_CT, gcl_priorities=[7]),
+}
+"""Parameters of port 1 of switch 2 per scenario token"""
+
+_SW3_PARAMS = {
+    'c203': dict(gcl=True, gcl_offset=80000, gcl_open=15000, gcl_cycle=_CT, gcl_priorities=[7, 6, 5]),
+    'c213': dict(gcl=True, gcl_offset=10000, gcl_open=45000, gcl_cycle=_CT, gcl_priorities=[7, 6, 5]),
+    'c223': dict(gcl=True, gcl_offset=10000, gcl_open=30000, gcl_cycle=75000, gcl_priorities=[7, 6, 5]),
+    'c233': dict(gcl=True, gcl_offset=10000, gcl_open=10000, gcl_cycle=_CT*2, gcl_priorities=[7]),
+    'c243': dict(gcl=True, gcl_offset=80000, gcl_open=10000, gcl_cycle=_CT, gcl_priorities=[7]),
+}
+"""Parameters of port 1 of switch 3 per scenario token"""
+
+_FP_PORT_PARAMS = dict(gcl_offset=0, gcl_open=_CT, gcl_cycle=_CT, express_priorities=[7], frame_preemption=True)
+"""Parameters of a frame preemption port in the scenario topologies"""
+
+_DEFAULT_PORT_PARAMS = dict(gcl_offset=0, gcl_open=_CT, gcl_cycle=_CT, express_priorities=[], gcl_priorities=[7, 6, 5, 4, 3, 2, 1, 0])
+"""Parameters of a strict priority port in the scenario topologies"""
+
+# The frame preemption tokens come after the TAS entries, preserving the
+# precedence of the old per-switch if/elif cascades
+_SW1_PARAMS['c301'] = _SW1_PARAMS['c701'] = _FP_PORT_PARAMS
+_SW2_PARAMS['c302'] = _SW2_PARAMS['c701'] = _FP_PORT_PARAMS
+_SW3_PARAMS['c303'] = _SW3_PARAMS['c701'] = _FP_PORT_PARAMS
+
 class PortAttrs(TypedDict):
     express_priorities: ExpressPriorities
     """Express priorities"""
+    express_priorities_mask: int
+    """Express priorities packed into an 8-bit mask (bit n = priority n)"""
     frame_preemption: bool
     """Whether frame preemption is enabled on the port"""
     gcl: bool
@@ -42,6 +92,8 @@ class PortAttrs(TypedDict):
     """Offset if the window of the GCL (ignored if GCL is disabled)"""
     gcl_priorities: GclPriorities
     """Priorities of the GCL window (ignored if GCL is disabled)"""
+    gcl_priorities_mask: int
+    """GCL priorities packed into an 8-bit mask (ignored if GCL is disabled)"""
 
 class Port(PortAttrs):
     name: str
@@ -69,6 +121,8 @@ class Node(NodeAttrs):
 class EdgeAttrs(TypedDict):
     link_speed: int
     """Link speed in Mbit/s on the edge"""
+    link_speed_bytes: float
+    """Link speed in bytes per second, precomputed once for the transmission duration calculations"""
     max_frame_size: int
     """Maximum frame size on the edge in bytes"""
     propagation_delay: int
@@ -158,8 +212,48 @@ class Topology:
         self.description = description
         """Optional description of the topology (empty string if no description is given)"""
 
+        self._node_attrs: "dict[str, dict]" = {}
+        """Attribute dict per node name, shared with the graph.
+        Accessors read this mirror directly; every G.nodes(data=True)[...] access
+        goes through networkx view machinery, a plain dict lookup does not.
+        """
+
+        self._edge_attrs: "dict[tuple, dict]" = {}
+        """Attribute dict per (node, node) pair, shared with the graph.
+        Both orientations are stored instead of canonicalizing the key,
+        so a lookup is a single dict hit without an ordering compare
+        (the second entry only costs one dict slot, not a copy of the attrs).
+        """
+
+        self._forwarding_node_names: "list[str]" = []
+        """Names of the forwarding nodes in insertion order"""
+
+        self._ports_by_node: "dict[str, list[str]]" = {}
+        """Full port node names per forwarding node name in insertion order"""
+
+        self._port_edges: "list[tuple]" = []
+        """Edges connecting two ports (i.e. the non-internal links) in insertion order"""
+
+        self._port_decomp: "dict[str, tuple]" = {}
+        """(forwarding node name, port name) per full port node name,
+        recorded at port creation so the accessors do not have to re-split"""
+
+        self._sync_domain: "dict[str, TsnDomain]" = {}
+        """Sync domain per forwarding node name, kept separately so
+        are_synchronized is two plain dict lookups"""
+
+        self._layout = None
+        """Cached spring layout (and node colors) for draw; invalidated
+        whenever a node, port or edge is added"""
+
     def add_node(self, name: str, processing_delay: int=DEFAULT_PROCESSING_DELAY, processing_jitter: int=DEFAULT_PROCESSING_JITTER, sync_domain: TsnDomain=DEFAULT_TSN_DOMAIN, sync_jitter: int=DEFAULT_SYNC_JITTER):
-        self.G.add_node("{!s}".format(name), forwarding_node=True, processing_delay=processing_delay, processing_jitter=processing_jitter, sync_domain=sync_domain, sync_jitter=sync_jitter)
+        name = "{!s}".format(name)
+        self.G.add_node(name, forwarding_node=True, processing_delay=processing_delay, processing_jitter=processing_jitter, sync_domain=sync_domain, sync_jitter=sync_jitter)
+        self._node_attrs[name] = self.G.nodes[name]
+        self._forwarding_node_names.append(name)
+        self._ports_by_node.setdefault(name, [])
+        self._sync_domain[name] = sync_domain
+        self._layout = None
 
     def add_port_to_node(self,
         node_name: str, 
@@ -186,44 +280,58 @@ class Topology:
             gcl_open=gcl_open,
             gcl_offset=gcl_offset,
             express_priorities=express_priorities,
+            express_priorities_mask=priority_list_to_mask(express_priorities),
             gcl_priorities=gcl_priorities,
+            gcl_priorities_mask=priority_list_to_mask(gcl_priorities),
             frame_preemption=frame_preemption
         )
+        self._node_attrs[new_name] = self.G.nodes[new_name]
+        self._ports_by_node.setdefault(node_name, []).append(new_name)
+        self._port_decomp[new_name] = (node_name, port_name)
         self.G.add_edge(node_name, new_name, internal=True)
+        self._edge_attrs[(node_name, new_name)] = self._edge_attrs[(new_name, node_name)] = self.G.edges[node_name, new_name]
+        self._layout = None
         return new_name
 
     def add_edge(self, port_a: str, port_b: str, link_speed: int=DEFAULT_LINK_SPEED, propagation_delay: int=DEFAULT_PROPAGATION_DELAY, transmission_jitter: int=DEFAULT_TRANSMISSION_JITTER, max_frame_size: int=DEFAULT_MAX_FRAME_SIZE):
         self.G.add_edge(port_a, port_b, internal=False, link_speed=link_speed,
+                        link_speed_bytes=link_speed / 8 * 1000000,
                         propagation_delay=propagation_delay, transmission_jitter=transmission_jitter, max_frame_size=max_frame_size)
-        # self.G.add_edge(port_b, port_a.split("-")[0], internal=False, link_speed=link_speed,
-        #                 propagation_delay=propagation_delay, transmission_jitter=transmission_jitter, max_frame_size=max_frame_size)
+        self._edge_attrs[(port_a, port_b)] = self._edge_attrs[(port_b, port_a)] = self.G.edges[port_a, port_b]
+        if '-' in port_a and '-' in port_b:
+            self._port_edges.append((port_a, port_b))
+        self._layout = None
 
     def add_streams(self, streams: List[Stream]):
         self.streams.extend(streams)
 
     def get_forwarding_node_names(self) -> List[str]:
         """Returns the names of all forwarding nodes in the topology"""
-        return [node_name for node_name in self.G.nodes if is_forwarding_node(node_name)]
+        return list(self._forwarding_node_names)
 
     def get_port_names(self) -> List[str]:
         """Returns the names of all ports in the topology"""
-        return [node_name for node_name in self.G.nodes if is_port(node_name)]
+        return [port_name for port_names in self._ports_by_node.values() for port_name in port_names]
 
     def get_port_names_of_node(self, node_name: str) -> List[str]:
         """Returns the names of the ports that belong to the given node
         """
-        return [port_name for port_name in self.G.nodes
-            if is_port(port_name) and self.get_forwarding_node_name_by_port(port_name) == node_name]
+        return list(self._ports_by_node.get(node_name, []))
 
     def get_forwarding_node_name_by_port(self, port_name: str) -> str:
         """Returns name of the forwarding node to which the given port belongs to
         """
-        forwarding_node_name = port_name.split("-")[0]
-        return forwarding_node_name
+        decomposed = self._port_decomp.get(port_name)
+        if decomposed is not None:
+            return decomposed[0]
+        return port_name.split("-", 1)[0]
 
     def get_port_name_by_port(self, port_name: str) -> str:
         """Returns name of the port without the prepended forwarding node name
         """
+        decomposed = self._port_decomp.get(port_name)
+        if decomposed is not None:
+            return decomposed[1]
         return port_name.split('-')[1]
 
     def are_synchronized(self, node1: str, node2: str) -> bool:
@@ -232,92 +340,113 @@ class Topology:
         @param node1 Name of the first node
         @param node2 Name of the second node
         """
-        domain_1 = self.G.nodes(data=True)[node1]["sync_domain"]
-        domain_2 = self.G.nodes(data=True)[node2]["sync_domain"]
-        return domain_1 is not None and domain_2 is not None and domain_1 == domain_2
+        domain_1 = self._sync_domain[node1]
+        # domain_1 == domain_2 is already False when only domain_2 is None
+        return domain_1 is not None and domain_1 == self._sync_domain[node2]
     
     def recalculate_gcl(self):
         """Updates the GCL window of each port based on the bandwidth of the streams
         TODO: deprecated?
         """
-        all_ports = [node for node in self.G.nodes if "-" in node]
+        all_ports = self.get_port_names()
+
+        # Index the streams by crossed node once instead of scanning every
+        # stream path per port
+        streams_per_node = defaultdict(list)
+        for stream in self.streams:
+            for node_name in stream.path:
+                streams_per_node[node_name].append(stream)
 
         for port in all_ports:
-            streams = [stream for stream in self.streams if port in stream.path]
-            total_bandwidth = sum([stream.get_bandwidth(port) for stream in streams]) + 20 * len(streams)
-            # TODO: link speed is hardcoded here and should be fetched from corresponding edge instead
-            window = get_transmission_duration(total_bandwidth, 1000)
-            old_window = self.G.nodes(data=True)[port]["gcl_open"]
-            self.G.nodes(data=True)[port]["gcl_open"] = max(old_window, window)
+            streams = streams_per_node.get(port, [])
+            bandwidths = np.fromiter((stream.get_bandwidth(port) for stream in streams), dtype=np.int64, count=len(streams))
+            total_bandwidth = int(bandwidths.sum()) + 20 * bandwidths.size
+            window = get_transmission_duration(total_bandwidth, _GCL_LINK_SPEED_BYTES)
+            port_attrs = self._node_attrs[port]
+            old_window = port_attrs["gcl_open"]
+            port_attrs["gcl_open"] = max(old_window, window)
             debug(f"New window for port {port}: {max(old_window, window)}")
 
     def draw(self):
-        # Differentiate between forwarding nodes and port nodes by giving them a different color
-        node_color = ['red' if node['forwarding_node'] == True else 'blue' for i, node in self.G.nodes(data=True)]
-        nx.draw(self.G, pos=nx.spring_layout(self.G), with_labels = True, node_color=node_color)
+        # The spring layout is an iterative physics simulation, so it is
+        # computed once (with a fixed seed, so repeated draws look the same)
+        # and cached together with the node colors until the graph changes
+        if self._layout is None:
+            # Differentiate between forwarding nodes and port nodes by giving them a different color
+            node_color = ['red' if attrs['forwarding_node'] == True else 'blue' for attrs in self._node_attrs.values()]
+            self._layout = (nx.spring_layout(self.G, seed=0), node_color)
+        pos, node_color = self._layout
+        nx.draw(self.G, pos=pos, with_labels = True, node_color=node_color)
         plt.show()
 
+    def _port_to_json(self, port_name: str) -> PortJson:
+        port_data: PortAttrs = self._node_attrs[port_name]
+        # Read each attribute from the dict exactly once; ports left at
+        # their defaults still share the module-level default objects,
+        # so the identity checks skip the element-wise list comparisons
+        frame_preemption = port_data['frame_preemption']
+        express_priorities = port_data['express_priorities']
+        gcl = port_data['gcl']
+        gcl_cycle = port_data['gcl_cycle']
+        gcl_open = port_data['gcl_open']
+        gcl_offset = port_data['gcl_offset']
+        gcl_priorities = port_data['gcl_priorities']
+        default_cycle, default_open, default_offset, default_priorities = _GCL_PORT_DEFAULTS
+        port: PortJson = {
+            # Every exported port was registered in _port_decomp at creation,
+            # so the name comes out of the recorded decomposition instead of
+            # re-deriving it from the node name
+            'name': self._port_decomp[port_name][1],
+            'framePreemption': frame_preemption
+        }
+        if frame_preemption or (express_priorities is not DEFAULT_EXPRESS_PRIORITIES and express_priorities != DEFAULT_EXPRESS_PRIORITIES):
+            port['expressPriorities'] = express_priorities
+        port['gcl'] = gcl
+        if gcl or gcl_cycle != default_cycle:
+            port['gclCycle'] = gcl_cycle
+        if gcl or gcl_open != default_open:
+            port['gclOpen'] = gcl_open
+        if gcl or gcl_offset != default_offset:
+            port['gclOffset'] = gcl_offset
+        if gcl or (gcl_priorities is not default_priorities and gcl_priorities != default_priorities):
+            port['gclPriorities'] = gcl_priorities
+        return port
+
+    def _node_to_json(self, node_name: str) -> NodeJson:
+        node_data: NodeAttrs = self._node_attrs[node_name]
+        node: NodeJson = {
+            'name': node_name,
+            'processingDelay': node_data['processing_delay'],
+            'processingJitter': node_data['processing_jitter'],
+            'syncDomain': node_data['sync_domain']
+        }
+        if node_data['sync_domain'] == True or node_data['sync_jitter'] != DEFAULT_SYNC_JITTER:
+            node['syncJitter'] = node_data['sync_jitter']
+        node['ports'] = [self._port_to_json(port_name) for port_name in self._ports_by_node[node_name]]
+        return node
+
+    def _edge_to_json(self, edge_elem: tuple) -> EdgeJson:
+        edge_data: EdgeAttrs = self._edge_attrs[edge_elem]
+        return {
+            'port1': list(self._port_decomp[edge_elem[0]]),
+            'port2': list(self._port_decomp[edge_elem[1]]),
+            'linkSpeed': edge_data['link_speed'],
+            'maxFrameSize': edge_data['max_frame_size'],
+            'propagationDelay': edge_data['propagation_delay'],
+            'transmissionJitter': edge_data['transmission_jitter']
+        }
+
     def to_json(self) -> TopologyJson:
         topology: TopologyJson = {}
         topology['name'] = self.name
-        if self.description is not None or self.description != '':
+        if self.description:
             topology['description'] = self.description
-        topology['nodes'] = []
-        topology['edges'] = []
-        topology['streams'] = []
-
-        for node_name in self.get_forwarding_node_names():
-            node_data: NodeAttrs = self.G.nodes(data=True)[node_name]
-            node: NodeJson = {}
-            node['name'] = node_name
-            node['processingDelay'] = node_data['processing_delay']
-            node['processingJitter'] = node_data['processing_jitter']
-            node['syncDomain'] = node_data['sync_domain']
-            if node_data['sync_domain'] == True or node_data['sync_jitter'] != DEFAULT_SYNC_JITTER:
-                node['syncJitter'] = node_data['sync_jitter']
-            node['ports'] = []
-
-            for port_name in self.get_port_names_of_node(node_name):
-                port_data: PortAttrs = self.G.nodes(data=True)[port_name]
-                port: PortJson = {}
-                port['name'] = port_name.replace(node_name + '-', '')
-                port['framePreemption'] = port_data['frame_preemption']
-                if port_data['frame_preemption'] == True or port_data['express_priorities'] != DEFAULT_EXPRESS_PRIORITIES:
-                    port['expressPriorities'] = port_data['express_priorities']
-                port['gcl'] = port_data['gcl']
-                if port_data['gcl'] == True or port_data['gcl_cycle'] != DEFAULT_GCL_CYCLE:
-                    port['gclCycle'] = port_data['gcl_cycle']
-                if port_data['gcl'] == True or port_data['gcl_open'] != DEFAULT_GCL_OPEN:
-                    port['gclOpen'] = port_data['gcl_open']
-                if port_data['gcl'] == True or port_data['gcl_offset'] != DEFAULT_GCL_OFFSET:
-                    port['gclOffset'] = port_data['gcl_offset']
-                if port_data['gcl'] == True or port_data['gcl_priorities'] != DEFAULT_GCL_PRIORITIES:
-                    port['gclPriorities'] = port_data['gcl_priorities']
-                node['ports'].append(port)
-
-            topology['nodes'].append(node)
-
-        # Filter out all edges that are no connections between two ports
-        edges = [edge for edge in self.G.edges() if is_port(edge[0]) and is_port(edge[1])]
-        for edge_elem in edges:
-            edge_data: EdgeAttrs = self.G.edges[edge_elem]
-            edge: EdgeJson = {}
-            edge["port1"] = [
-                self.get_forwarding_node_name_by_port(edge_elem[0]),
-                self.get_port_name_by_port(edge_elem[0])
-            ]
-            edge["port2"] = [
-                self.get_forwarding_node_name_by_port(edge_elem[1]),
-                self.get_port_name_by_port(edge_elem[1])
-            ]
-            edge['linkSpeed'] = edge_data['link_speed']
-            edge['maxFrameSize'] = edge_data['max_frame_size']
-            edge['propagationDelay'] = edge_data['propagation_delay']
-            edge['transmissionJitter'] = edge_data['transmission_jitter']
-            topology['edges'].append(edge)
-
-        for stream in self.streams:
-            topology['streams'].append(stream.to_json())
+        # Comprehensions over the internal containers; only the connections
+        # between two ports are exported and add_edge keeps them in a
+        # dedicated list, so no full edge scan is needed here
+        topology['nodes'] = [self._node_to_json(node_name) for node_name in self._forwarding_node_names]
+        topology['edges'] = [self._edge_to_json(edge_elem) for edge_elem in self._port_edges]
+        topology['streams'] = [stream.to_json() for stream in self.streams]
 
         return topology
 
@@ -364,14 +493,10 @@ class Topology:
         """
         Tries to convert any input to a list that follows the definition of a priority list. Raises in case of error.
         """
-        priorities = []
+        priorities = [int(value) for value in raw_priorities]
 
-        for value in raw_priorities:
-            i = int(value)
-            if i >= 0 and i <= 7:
-                priorities.append(i)
-            else:
-                raise
+        if any(value < 0 or value > 7 for value in priorities):
+            raise ValueError('Priorities must be between 0 and 7')
 
         return priorities
 
@@ -471,36 +596,68 @@ class Topology:
 
             topology_instance = Topology(str(topology['name']), str(topology.get('description', '')))
 
+            # All nodes and edges are collected first and inserted with one
+            # add_nodes_from/add_edges_from call, which networkx fast-paths
+            # instead of re-entering the single-add logic per entity; the
+            # internal mirror containers (see __init__) are filled alongside
+            node_batch = []
+            edge_batch = []
             for node in nodes:
-                topology_instance.add_node(
-                    name=node['name'],
+                name = node['name']
+                node_batch.append((name, dict(
+                    forwarding_node=True,
                     processing_delay=node['processing_delay'],
                     processing_jitter=node['processing_jitter'],
                     sync_domain=node['sync_domain'],
                     sync_jitter=node['sync_jitter']
-                )
+                )))
+                topology_instance._forwarding_node_names.append(name)
+                topology_instance._sync_domain[name] = node['sync_domain']
+                node_ports = topology_instance._ports_by_node.setdefault(name, [])
 
                 for port in node['ports']:
-                    topology_instance.add_port_to_node(
-                        node_name=node['name'],
-                        port_name=port['name'],
+                    port_node_name = name + '-' + port['name']
+                    node_batch.append((port_node_name, dict(
+                        forwarding_node=False,
                         gcl=port['gcl'],
                         gcl_cycle=port['gcl_cycle'],
                         gcl_open=port['gcl_open'],
                         gcl_offset=port['gcl_offset'],
                         express_priorities=port['express_priorities'],
+                        express_priorities_mask=priority_list_to_mask(port['express_priorities']),
                         gcl_priorities=port['gcl_priorities'],
+                        gcl_priorities_mask=priority_list_to_mask(port['gcl_priorities']),
                         frame_preemption=port['frame_preemption']
-                    )
+                    )))
+                    node_ports.append(port_node_name)
+                    topology_instance._port_decomp[port_node_name] = (name, port['name'])
+                    edge_batch.append((name, port_node_name, dict(internal=True)))
+
             for edge in edges:
-                topology_instance.add_edge(
-                    port_a=f'{edge["node1_name"]}-{edge["port1_name"]}',
-                    port_b=f'{edge["node2_name"]}-{edge["port2_name"]}',
+                port_a = f'{edge["node1_name"]}-{edge["port1_name"]}'
+                port_b = f'{edge["node2_name"]}-{edge["port2_name"]}'
+                edge_batch.append((port_a, port_b, dict(
+                    internal=False,
                     link_speed=edge['link_speed'],
+                    link_speed_bytes=edge['link_speed'] / 8 * 1000000,
                     propagation_delay=edge['propagation_delay'],
                     transmission_jitter=edge['transmission_jitter'],
                     max_frame_size=edge['max_frame_size']
-                )
+                )))
+                topology_instance._port_edges.append((port_a, port_b))
+
+            G = topology_instance.G
+            G.add_nodes_from(node_batch)
+            G.add_edges_from(edge_batch)
+
+            # The mirrors share the attribute dicts with the graph, so they
+            # are wired after the bulk insert created them
+            graph_nodes = G.nodes
+            topology_instance._node_attrs = {name: graph_nodes[name] for name, _ in node_batch}
+            graph_edges = G.edges
+            edge_attrs = topology_instance._edge_attrs
+            for node_a, node_b, _ in edge_batch:
+                edge_attrs[(node_a, node_b)] = edge_attrs[(node_b, node_a)] = graph_edges[node_a, node_b]
 
             topology_instance.add_streams(streams)
 
@@ -514,45 +671,31 @@ class Topology:
             raise TopologyParsingError('Error parsing topology')
 
     def from_toponame(self, scenario):
+        # One pass extracts all scenario tokens up front; every check below is
+        # then a hash lookup instead of a substring scan over the whole name
+        tokens = frozenset(re.findall(r'c\d{3}', scenario))
+        sync_flags = frozenset(re.findall(r'\d-sTrue-', scenario))
+
         window = 0 if "w0" in scenario else 20
         
-        sp1 = True if "c101" in scenario else False
-        sp1 = True if "c501" in scenario else sp1
-        sp2 = True if "c102" in scenario else False
-        sp2 = True if "c502" in scenario else sp2
-        sp3 = True if "c103" in scenario else False
-        sp3 = True if "c503" in scenario else sp3
-        
-        tas1_1 = True if "c201" in scenario else False
-        tas1_2 = True if "c211" in scenario else False
-        tas1_3 = True if "c221" in scenario else False
-        
-        tas2_1 = True if "c202" in scenario else False
-        tas2_2 = True if "c212" in scenario else False
-        tas2_3 = True if "c222" in scenario else False
-        tas2_4 = True if "c232" in scenario else False
-        tas2_5 = True if "c242" in scenario else False
-        
-        tas3_1 = True if "c203" in scenario else False
-        tas3_2 = True if "c213" in scenario else False
-        tas3_3 = True if "c223" in scenario else False
-        tas3_4 = True if "c233" in scenario else False
-        tas3_5 = True if "c243" in scenario else False
+        # Each switch port resolves directly to its parameter set: the first
+        # matching table token wins, strict priority is the fallback
+        sw1_params = next((params for token, params in _SW1_PARAMS.items() if token in tokens), _DEFAULT_PORT_PARAMS)
+        sw2_params = next((params for token, params in _SW2_PARAMS.items() if token in tokens), _DEFAULT_PORT_PARAMS)
+        sw3_params = next((params for token, params in _SW3_PARAMS.items() if token in tokens), _DEFAULT_PORT_PARAMS)
         
-        fp1 = True if "c301" in scenario else False
-        fp1 = True if "c701" in scenario else fp1
-        fp2 = True if "c302" in scenario else False
-        fp2 = True if "c701" in scenario else fp2
-        fp3 = True if "c303" in scenario else False
-        fp3 = True if "c701" in scenario else fp3
+        # The slow-link groupings are reused for the edges and stream sizes below
+        slow_link1 = "c501" in tokens or "c701" in tokens
+        slow_link2 = "c502" in tokens or "c702" in tokens
+        slow_link3 = "c503" in tokens or "c703" in tokens
         
-        sync1 = "1" if "1-sTrue-" in scenario else "0"
-        sync2 = "1" if "2-sTrue-" in scenario else "2"
+        sync1 = "1" if "1-sTrue-" in sync_flags else "0"
+        sync2 = "1" if "2-sTrue-" in sync_flags else "2"
         
         all_bc = []
         all_wc = []
         
-        CT = 100000 # 100µs
+        CT = _CT
 
         #for offset in range(0, window, 1):
         #topo = topology.Topology("tmp")
@@ -567,56 +710,21 @@ class Topology:
 
 
         switch_one   = self.add_node("switch 1", sync_domain=sync1, processing_delay=1000, processing_jitter=80)
-        if tas1_1:
-            s1_1 = self.add_port_to_node("switch 1", "1", gcl=True, gcl_offset=10000, gcl_open=55000, gcl_cycle=CT, gcl_priorities=[7])
-        elif tas1_2:
-            s1_1 = self.add_port_to_node("switch 1", "1", gcl=True, gcl_offset=30000, gcl_open=55000, gcl_cycle=CT, gcl_priorities=[7])
-        elif tas1_3:
-            s1_1 = self.add_port_to_node("switch 1", "1", gcl=True, gcl_offset=15000, gcl_open=20000, gcl_cycle=CT/2, gcl_priorities=[7])
-        elif fp1:
-            s1_1 = self.add_port_to_node("switch 1", "1", gcl_offset=0, gcl_open=CT, gcl_cycle=CT, express_priorities=[7], frame_preemption=True)
-        else:
-            s1_1 = self.add_port_to_node("switch 1", "1", gcl_offset=0, gcl_open=CT, gcl_cycle=CT, express_priorities=[], gcl_priorities=[7, 6, 5, 4, 3, 2, 1, 0])
+        s1_1 = self.add_port_to_node("switch 1", "1", **sw1_params)
         s1_2 = self.add_port_to_node("switch 1", "2", gcl_offset=0, gcl_open=CT, gcl_cycle=CT)
         s1_3 = self.add_port_to_node("switch 1", "3", gcl_offset=0, gcl_open=CT, gcl_cycle=CT)
 
 
 
         switch_two   = self.add_node("switch 2", sync_domain="1", processing_delay=1000, processing_jitter=80)
-        if tas2_1:
-            s2_1 = self.add_port_to_node("switch 2", "1", gcl=True, gcl_offset=5000,  gcl_open=25000, gcl_cycle=CT, gcl_priorities=[7])
-        elif tas2_2:
-            s2_1 = self.add_port_to_node("switch 2", "1", gcl=True, gcl_offset=25000, gcl_open=55000, gcl_cycle=CT, gcl_priorities=[7])
-        elif tas2_3:
-            s2_1 = self.add_port_to_node("switch 2", "1", gcl=True, gcl_offset=25000, gcl_open=80000, gcl_cycle=CT*2, gcl_priorities=[7])
-        elif tas2_4:
-            s2_1 = self.add_port_to_node("switch 2", "1", gcl=True, gcl_offset=25000, gcl_open=80000, gcl_cycle=CT*3, gcl_priorities=[7])
-        elif tas2_5:
-            s2_1 = self.add_port_to_node("switch 2", "1", gcl=True, gcl_offset=5000, gcl_open=80000, gcl_cycle=CT, gcl_priorities=[7])
-        elif fp2:
-            s2_1 = self.add_port_to_node("switch 2", "1", gcl_offset=0, gcl_open=CT, gcl_cycle=CT, express_priorities=[7], frame_preemption=True)
-        else:
-            s2_1 = self.add_port_to_node("switch 2", "1", gcl_offset=0, gcl_open=CT, gcl_cycle=CT, express_priorities=[], gcl_priorities=[7, 6, 5, 4, 3, 2, 1, 0])
+        s2_1 = self.add_port_to_node("switch 2", "1", **sw2_params)
         s2_2 = self.add_port_to_node("switch 2", "2", gcl_offset=0, gcl_open=CT, gcl_cycle=CT)
         s2_3 = self.add_port_to_node("switch 2", "3", gcl_offset=0, gcl_open=CT, gcl_cycle=CT)
 
 
 
         switch_three = self.add_node("switch 3", sync_domain=sync2, processing_delay=1000, processing_jitter=80)
-        if tas3_1:
-            s3_1 = self.add_port_to_node("switch 3", "1", gcl=True, gcl_offset=80000, gcl_open=15000, gcl_cycle=CT, gcl_priorities=[7, 6, 5])
-        elif tas3_2:
-            s3_1 = self.add_port_to_node("switch 3", "1", gcl=True, gcl_offset=10000, gcl_open=45000, gcl_cycle=CT, gcl_priorities=[7, 6, 5])
-        elif tas3_3:
-            s3_1 = self.add_port_to_node("switch 3", "1", gcl=True, gcl_offset=10000, gcl_open=30000, gcl_cycle=75000, gcl_priorities=[7, 6, 5])
-        elif tas3_4:
-            s3_1 = self.add_port_to_node("switch 3", "1", gcl=True, gcl_offset=10000, gcl_open=10000, gcl_cycle=CT*2, gcl_priorities=[7])
-        elif tas3_5:
-            s3_1 = self.add_port_to_node("switch 3", "1", gcl=True, gcl_offset=80000, gcl_open=10000, gcl_cycle=CT, gcl_priorities=[7])
-        elif fp3:
-            s3_1 = self.add_port_to_node("switch 3", "1", gcl_offset=0, gcl_open=CT, gcl_cycle=CT, express_priorities=[7], frame_preemption=True)
-        else:
-            s3_1 = self.add_port_to_node("switch 3", "1", gcl_offset=0, gcl_open=CT, gcl_cycle=CT, express_priorities=[], gcl_priorities=[7, 6, 5, 4, 3, 2, 1, 0])
+        s3_1 = self.add_port_to_node("switch 3", "1", **sw3_params)
         s3_2 = self.add_port_to_node("switch 3", "2", gcl_offset=0, gcl_open=CT, gcl_cycle=CT)
         s3_3 = self.add_port_to_node("switch 3", "3", gcl_offset=0, gcl_open=CT, gcl_cycle=CT)
 
@@ -632,17 +740,17 @@ class Topology:
 
 
         self.add_edge(t_1, s1_2)
-        if "c501" in scenario or "c701" in scenario:
+        if slow_link1:
             self.add_edge(s1_1, s2_2, link_speed=100, max_frame_size=300)
         else:
             self.add_edge(s1_1, s2_2)
             
-        if "c502" in scenario or "c702" in scenario:
+        if slow_link2:
             self.add_edge(s2_1, s3_2, link_speed=100, max_frame_size=300)
         else:
             self.add_edge(s2_1, s3_2)
             
-        if "c503" in scenario or "c703" in scenario:
+        if slow_link3:
             self.add_edge(s3_1, l_1, link_speed=100, max_frame_size=300)
         else:
             self.add_edge(s3_1, l_1)
@@ -656,24 +764,24 @@ class Topology:
         stream_size_1 = 1000
         stream_size_2 = 1000
         stream_size_3 = 1000
-        if "c501" in scenario or "c701" in scenario:
+        if slow_link1:
             stream_size_1 = 500
             #stream_size_2 = 450
 
-        if "c502" in scenario or "c702" in scenario:
+        if slow_link2:
             stream_size_2 = 500
 
-        if "c503" in scenario or "c703" in scenario:
+        if slow_link3:
             stream_size_3 = 500
             
         
-        if "c501" in scenario or "c502" in scenario or "c503" in scenario or "c701" in scenario or "c702" in scenario or "c703" in scenario:
+        if slow_link1 or slow_link2 or slow_link3:
             stream_size = 100
         else:
             stream_size = 1000
 
 
-        if "c501" in scenario or "c502" in scenario or "c701" in scenario or "c702" in scenario:
+        if slow_link1 or slow_link2:
             stream1 = Stream(cycletime=CT, offset=10000, framesize=200, sender="talker", receiver="listener", priority=7, name="Stream 1", transmission_window=(window+1)*1000) 
         else:
             stream1 = Stream(cycletime=CT, offset=10000, framesize=200, sender="talker", receiver="listener", priority=7, name="Stream 1", transmission_window=(window+1)*1000) 